@@ -1,19 +1,15 @@
 import os
-from config.config import co
+import asyncio
+import weakref
+from config.config import aco
 from utils.resilience import llm_retry
+from utils.compression import compress_context
 
 
-class ArticleGeneratorAgent:
-    """Generates publication-ready articles from repository context and user instructions."""
-    
-    def __init__(self):
-        self.model = "command-a-03-2025"
-        
-    @llm_retry
-    def generate(self, repo_context: str, user_instructions: str, project_description: str = "") -> str:
-        """Generate article based on repo context and user instructions."""
-        
-        prompt = f"""You are an expert technical writer specializing in creating publication-ready articles about software projects.
+# Static instruction blocks are kept in module constants and sent as the chat
+# preamble, identical across calls, so providers can serve them from prompt
+# cache. Variable content goes in the message, ordered most-stable first.
+ARTICLE_SYSTEM_PREFIX = """You are an expert technical writer specializing in creating publication-ready articles about software projects.
 
 Your task is to generate a well-structured, engaging article based on the repository content and user instructions.
 
@@ -27,75 +23,147 @@ Guidelines:
 7. Include relevant technical details from the repository
 8. Write with proper markdown formatting
 
-REPOSITORY CONTEXT:
+Please generate a complete, well-structured article following the user's instructions. Include [TODO: ...] tags for any sections that need manual review or additional information."""
+
+OUTLINE_SYSTEM_PREFIX = """You are an expert at creating article outlines. Generate a detailed outline for the article based on the repository and instructions.
+Format: Use markdown with numbered/bulleted lists.
+
+Provide a comprehensive outline that will guide the article creation. Use clear hierarchical structure with main sections and subsections."""
+
+
+class ArticleGeneratorAgent:
+    """Generates publication-ready articles from repository context and user instructions."""
+
+    # Cap on concurrent in-flight LLM calls to respect provider rate limits
+    MAX_CONCURRENT_CALLS = 4
+
+    def __init__(self):
+        self.model = "command-a-03-2025"
+        # One semaphore per event loop (weak-keyed so finished loops are
+        # collectable): lets a single agent instance be reused across
+        # successive asyncio.run calls without binding errors.
+        self._semaphores = weakref.WeakKeyDictionary()
+
+    @property
+    def _semaphore(self):
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_CALLS)
+            self._semaphores[loop] = semaphore
+        return semaphore
+
+    def _build_article_message(self, repo_context: str, user_instructions: str, project_description: str = "") -> str:
+        return f"""REPOSITORY CONTEXT:
 {repo_context}
 
 PROJECT DESCRIPTION (if provided):
 {project_description if project_description else "No additional description provided"}
 
 USER INSTRUCTIONS FOR ARTICLE:
-{user_instructions}
+{user_instructions}"""
 
-Please generate a complete, well-structured article following the user's instructions. Include [TODO: ...] tags for any sections that need manual review or additional information."""
+    def _build_outline_message(self, repo_context: str, user_instructions: str) -> str:
+        return f"""REPOSITORY CONTEXT:
+{repo_context}
+
+USER INSTRUCTIONS:
+{user_instructions}"""
+
+    def _build_summary_prompt(self, file_content: str) -> str:
+        return f"""Summarize the following file content in 2-3 sentences:
+
+{file_content}
+
+Summary:"""
+
+    # ---- Async API (primary) ----
+
+    @llm_retry
+    async def agenerate(self, repo_context: str, user_instructions: str, project_description: str = "") -> str:
+        """Generate article based on repo context and user instructions."""
+        repo_context = compress_context(repo_context)
+        message = self._build_article_message(repo_context, user_instructions, project_description)
 
         try:
-            response = co.chat(
-                message=prompt,
-                model=self.model,
-                max_tokens=4096
-            )
-            
-            article = response.text.strip()
-            return article
-            
+            async with self._semaphore:
+                response = await aco.chat(
+                    message=message,
+                    preamble=ARTICLE_SYSTEM_PREFIX,
+                    model=self.model,
+                    max_tokens=4096
+                )
+            return response.text.strip()
         except Exception as e:
             raise Exception(f"Failed to generate article: {str(e)}")
 
     @llm_retry
-    def generate_outline(self, repo_context: str, user_instructions: str) -> str:
+    async def agenerate_outline(self, repo_context: str, user_instructions: str) -> str:
         """Generate article outline first before full article."""
-        
-        prompt = f"""You are an expert at creating article outlines. Generate a detailed outline for the article based on the repository and instructions.
-Format: Use markdown with numbered/bulleted lists.
-
-REPOSITORY CONTEXT:
-{repo_context}
-
-USER INSTRUCTIONS:
-{user_instructions}
-
-Provide a comprehensive outline that will guide the article creation. Use clear hierarchical structure with main sections and subsections."""
+        message = self._build_outline_message(repo_context, user_instructions)
 
         try:
-            response = co.chat(
-                message=prompt,
-                model=self.model,
-                max_tokens=2048
-            )
-            
+            async with self._semaphore:
+                response = await aco.chat(
+                    message=message,
+                    preamble=OUTLINE_SYSTEM_PREFIX,
+                    model=self.model,
+                    max_tokens=2048
+                )
             return response.text.strip()
-            
         except Exception as e:
             raise Exception(f"Failed to generate outline: {str(e)}")
 
     @llm_retry
-    def extract_summary(self, file_content: str) -> str:
+    async def aextract_summary(self, file_content: str) -> str:
         """Extract key summary from file content."""
-        
-        prompt = f"""Summarize the following file content in 2-3 sentences:
+        prompt = self._build_summary_prompt(file_content)
 
-{file_content}
+        try:
+            async with self._semaphore:
+                response = await aco.chat(
+                    message=prompt,
+                    model=self.model,
+                    max_tokens=200
+                )
+            return response.text.strip()
+        except Exception as e:
+            return "[TODO: Add manual summary]"
 
-Summary:"""
+    async def stream_generate(self, repo_context: str, user_instructions: str, project_description: str = ""):
+        """Yield article text chunks as the model produces them.
 
-        try:
-            response = co.chat(
-                message=prompt,
+        Callers get a first token after prefill instead of waiting for the
+        full 4096-token response; join the chunks for the complete article.
+        """
+        repo_context = compress_context(repo_context)
+        message = self._build_article_message(repo_context, user_instructions, project_description)
+
+        async with self._semaphore:
+            stream = aco.chat_stream(
+                message=message,
+                preamble=ARTICLE_SYSTEM_PREFIX,
                 model=self.model,
-                max_tokens=200
+                max_tokens=4096
             )
-            
-            return response.text.strip()
-            
-        except Exception as e:
-            return "[TODO: Add manual summary]" 
+            async for event in stream:
+                if getattr(event, "event_type", None) == "text-generation":
+                    yield event.text
+
+    async def summarize_files(self, files):
+        """Summarize many files concurrently (bounded by the semaphore)."""
+        return await asyncio.gather(*[self.aextract_summary(f) for f in files])
+
+    # ---- Sync wrappers (backward compat) ----
+
+    def generate(self, repo_context: str, user_instructions: str, project_description: str = "") -> str:
+        """Generate article based on repo context and user instructions."""
+        return asyncio.run(self.agenerate(repo_context, user_instructions, project_description))
+
+    def generate_outline(self, repo_context: str, user_instructions: str) -> str:
+        """Generate article outline first before full article."""
+        return asyncio.run(self.agenerate_outline(repo_context, user_instructions))
+
+    def extract_summary(self, file_content: str) -> str:
+        """Extract key summary from file content."""
+        return asyncio.run(self.aextract_summary(file_content))
@@ -0,0 +1,76 @@
+# agents/batch_processor.py
+import asyncio
+
+try:
+    import orjson as json
+except ImportError:
+    import json
+
+from config.config import aco
+
+# Per-file content small enough that several summaries fit one packed prompt
+PACKED_MAX_FILE_CHARS = 2000
+PACKED_MAX_TOTAL_CHARS = 12000
+
+
+async def summarize_many(agent, file_contents, concurrency=8):
+    """
+    Summarize many file contents through an ArticleGeneratorAgent.
+
+    Small batches are packed into a single labeled prompt (one round-trip);
+    otherwise each file is dispatched concurrently under a semaphore so fixed
+    per-request overhead is amortized across in-flight calls.
+    """
+    if not file_contents:
+        return []
+
+    total = sum(len(c) for c in file_contents)
+    if (len(file_contents) > 1
+            and total <= PACKED_MAX_TOTAL_CHARS
+            and all(len(c) <= PACKED_MAX_FILE_CHARS for c in file_contents)):
+        packed = await _summarize_packed(agent, file_contents)
+        if packed is not None:
+            return packed
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def summarize_one(content):
+        async with semaphore:
+            return await agent.aextract_summary(content)
+
+    return await asyncio.gather(*[summarize_one(c) for c in file_contents])
+
+
+async def _summarize_packed(agent, file_contents):
+    """Summarize all files with one labeled prompt; None on parse failure."""
+    sections = "\n\n".join(
+        f"--- FILE {i} ---\n{content}" for i, content in enumerate(file_contents)
+    )
+    prompt = f"""Summarize each of the following files in 2-3 sentences.
+Respond with a JSON array of strings, one summary per file, in order.
+
+{sections}
+
+JSON array:"""
+
+    try:
+        response = await aco.chat(
+            message=prompt,
+            model=agent.model,
+            max_tokens=200 * len(file_contents)
+        )
+        text = response.text.strip()
+        # tolerate markdown fencing around the JSON
+        if text.startswith("```"):
+            text = text.strip("`").lstrip("json").strip()
+        summaries = json.loads(text)
+        if isinstance(summaries, list) and len(summaries) == len(file_contents):
+            return [str(s).strip() for s in summaries]
+    except Exception:
+        pass
+    return None
+
+
+def summarize_files(agent, file_contents, concurrency=8):
+    """Sync wrapper around summarize_many."""
+    return asyncio.run(summarize_many(agent, file_contents, concurrency=concurrency))
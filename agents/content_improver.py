@@ -1,5 +1,6 @@
 # agents/content_improver.py
 import json
+from functools import lru_cache
 
 def improve(repo_summary, metadata):
     readme = repo_summary.get("readme", "")
@@ -31,16 +32,17 @@ def improve(repo_summary, metadata):
 
 def analyze_readme_quality(readme):
     improvements = []
-    
+    readme_lower = readme.lower()
+
     if len(readme) < 100:
         improvements.append("README is too short - expand with more details")
-    
+
     sections = {
-        "installation": "install" in readme.lower(),
-        "usage": "usage" in readme.lower() or "how" in readme.lower(),
-        "features": "feature" in readme.lower(),
-        "contributing": "contribut" in readme.lower(),
-        "license": "license" in readme.lower()
+        "installation": "install" in readme_lower,
+        "usage": "usage" in readme_lower or "how" in readme_lower,
+        "features": "feature" in readme_lower,
+        "contributing": "contribut" in readme_lower,
+        "license": "license" in readme_lower
     }
     
     for section, exists in sections.items():
@@ -56,38 +58,42 @@ def analyze_readme_quality(readme):
     return improvements
 
 def generate_readme_structure(project_type, missing):
+    return list(_readme_structure(project_type.lower(), "badge" in str(missing).lower()))
+
+@lru_cache(maxsize=64)
+def _readme_structure(project_type, badge_missing):
     structure = []
-    
+
     structure.append("# Project Title")
     structure.append("Brief description (one line)")
-    
-    if "badge" not in str(missing).lower():
+
+    if not badge_missing:
         structure.append("Badges section")
-    
+
     structure.append("## Features")
     structure.append("- Feature 1")
     structure.append("- Feature 2")
     
     structure.append("## Installation")
-    
-    if "python" in project_type.lower():
+
+    if "python" in project_type:
         structure.append("```bash\npip install project-name\n```")
-    elif "node" in project_type.lower() or "javascript" in project_type.lower():
+    elif "node" in project_type or "javascript" in project_type:
         structure.append("```bash\nnpm install project-name\n```")
-    elif "rust" in project_type.lower():
+    elif "rust" in project_type:
         structure.append("```bash\ncargo add project-name\n```")
-    
+
     structure.append("## Usage")
     structure.append("```python\n# Example code\n```")
-    
+
     structure.append("## API Reference")
     structure.append("## Configuration")
     structure.append("## Performance")
     structure.append("## Testing")
     structure.append("## Contributing")
     structure.append("## License")
-    
-    return structure
+
+    return tuple(structure)
 
 def generate_improved_readme(readme, structure, badges, project_type):
     if readme:
@@ -102,61 +108,77 @@ def generate_improved_readme(readme, structure, badges, project_type):
     return improved
 
 def get_image_suggestions(project_type):
+    return list(_image_suggestions(project_type.lower()))
+
+@lru_cache(maxsize=64)
+def _image_suggestions(project_type):
     suggestions = []
-    
+
     suggestions.append("Architecture diagram")
     suggestions.append("Feature overview diagram")
-    
-    if "ml" in project_type.lower() or "data" in project_type.lower():
+
+    if "ml" in project_type or "data" in project_type:
         suggestions.append("Performance comparison chart")
         suggestions.append("Model architecture diagram")
-    
-    if "web" in project_type.lower():
+
+    if "web" in project_type:
         suggestions.append("UI screenshot")
         suggestions.append("Workflow diagram")
-    
+
     suggestions.append("Installation steps flowchart")
-    
-    return suggestions[:5]
+
+    return tuple(suggestions[:5])
 
 def get_example_suggestions(project_type, structure):
+    return list(_example_suggestions(project_type.lower(), bool(structure.get("has_api"))))
+
+@lru_cache(maxsize=64)
+def _example_suggestions(project_type, has_api):
     examples = []
-    
+
     examples.append("Basic usage example")
     examples.append("Advanced usage example")
-    
-    if structure.get("has_api"):
+
+    if has_api:
         examples.append("API endpoint examples")
-    
-    if "ml" in project_type.lower():
+
+    if "ml" in project_type:
         examples.append("Training example")
         examples.append("Inference example")
-    
-    if "web" in project_type.lower():
+
+    if "web" in project_type:
         examples.append("Server setup example")
         examples.append("Client integration example")
-    
+
     examples.append("Configuration examples")
-    
-    return examples[:5]
+
+    return tuple(examples[:5])
 
 def get_badge_suggestions(project_type, structure):
+    return list(_badge_suggestions(
+        project_type.lower(),
+        bool(structure.get("has_docs")),
+        bool(structure.get("has_ci"))
+    ))
+
+@lru_cache(maxsize=64)
+def _badge_suggestions(project_type, has_docs, has_ci):
     badges = [
         "GitHub Workflow Status",
         "Test Coverage",
-        "PyPI version" if "python" in project_type.lower() else "npm version",
+        "PyPI version" if "python" in project_type else "npm version",
         "License",
     ]
-    
-    if structure.get("has_docs"):
+
+    if has_docs:
         badges.append("Documentation")
-    
-    if structure.get("has_ci"):
+
+    if has_ci:
         badges.append("Build Status")
-    
+
     badges.append("Contributors")
-    
-    return badges[:6]
+
+    return tuple(badges[:6])
 
 def calculate_quality_score(readme, structure, missing):
     score = 50
@@ -3,10 +3,49 @@ import os
 import uuid
 import requests
 import numpy as np
-from qdrant_client.models import VectorParams, Distance, PointStruct
+from concurrent.futures import ThreadPoolExecutor
+from qdrant_client.models import VectorParams, Distance, PointStruct, Batch
 from config.config import qdrant, JINA_API_KEY, JINA_EMBEDDING_MODEL, QDRANT_COLLECTION, EMBEDDING_DIM
 from utils.resilience import api_retry
 
+# Loaded once per process; SentenceTransformer init costs hundreds of ms
+_MODEL = None
+_MODEL_CACHE_DIR = os.path.join(".model_cache", "all-MiniLM-L6-v2")
+
+def _get_model():
+    global _MODEL
+    if _MODEL is None:
+        # Configure threading before the model is instantiated
+        os.environ.setdefault("TOKENIZERS_PARALLELISM", "true")
+        try:
+            import torch
+            torch.set_num_threads(os.cpu_count() or 1)
+        except Exception:
+            pass
+
+        from sentence_transformers import SentenceTransformer
+        if os.path.isdir(_MODEL_CACHE_DIR):
+            # local weights load via mmap/page cache, skipping the hub round-trip
+            model = SentenceTransformer(_MODEL_CACHE_DIR)
+        else:
+            model = SentenceTransformer('all-MiniLM-L6-v2')
+            try:
+                model.save(_MODEL_CACHE_DIR)
+            except Exception:
+                pass
+        try:
+            # Dynamic int8 quantization of the linear layers: CPU inference is
+            # memory-bandwidth-bound, so narrower weights give ~2-4x throughput
+            # with negligible quality loss for retrieval embeddings.
+            import torch
+            model[0].auto_model = torch.quantization.quantize_dynamic(
+                model[0].auto_model, {torch.nn.Linear}, dtype=torch.qint8
+            )
+        except Exception:
+            pass  # keep the FP32 model if quantization is unavailable
+        _MODEL = model
+    return _MODEL
+
 class EmbeddingAgent:
     def __init__(self):
         self.collection = QDRANT_COLLECTION
@@ -32,36 +71,46 @@ class EmbeddingAgent:
         Call Jina embeddings API with fallback to local embeddings.
         """
         try:
-            from sentence_transformers import SentenceTransformer
-            model = SentenceTransformer('all-MiniLM-L6-v2')
-            embeddings = model.encode(texts, normalize_embeddings=False)
-            return [list(emb) for emb in embeddings]
+            embeddings = _get_model().encode(
+                texts,
+                batch_size=64,
+                normalize_embeddings=False,
+                convert_to_numpy=True,
+                show_progress_bar=False
+            )
+            return embeddings.tolist()
         except Exception as e:
-            print(f"[FALLBACK] Using local embeddings (Jina failed: {e})")
-            try:
-                from sentence_transformers import SentenceTransformer
-                model = SentenceTransformer('all-MiniLM-L6-v2')
-                embeddings = model.encode(texts, normalize_embeddings=False)
-                return [list(emb) for emb in embeddings]
-            except Exception:
-                dummy_emb = [float(i % 100) / 100.0 for i in range(self.dim)]
-                return [dummy_emb] * len(texts)
+            print(f"[FALLBACK] Using dummy embeddings (local model failed: {e})")
+            # float32 zeros, one row per text — no shared-list aliasing
+            return np.zeros((len(texts), self.dim), dtype=np.float32).tolist()
 
     def add_texts(self, text_chunks, metadata_list=None, batch_size=32):
         """
         text_chunks: list[str]
         metadata_list: list[dict] or None (same length)
         """
+        if not text_chunks:
+            return
         metadata_list = metadata_list or [{} for _ in text_chunks]
-        for i in range(0, len(text_chunks), batch_size):
-            batch_texts = text_chunks[i:i+batch_size]
-            batch_meta = metadata_list[i:i+batch_size]
-            vectors = self._embed_with_jina(batch_texts)
-            points = [
-                PointStruct(id=str(uuid.uuid4()), vector=list(vec), payload={"text": txt, **meta})
-                for vec, txt, meta in zip(vectors, batch_texts, batch_meta)
-            ]
-            qdrant.upsert(collection_name=self.collection, points=points)
+        # One embedding pass over the full corpus — the encoder batches
+        # internally, so feeding it everything at once keeps its batches full
+        # instead of truncating them at the upsert size.
+        vectors = np.asarray(self._embed_with_jina(text_chunks), dtype=np.float32)
+        # Submit all upserts, then collect, so the RPCs overlap each other
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            futures = []
+            for i in range(0, len(text_chunks), batch_size):
+                batch_texts = text_chunks[i:i+batch_size]
+                batch_meta = metadata_list[i:i+batch_size]
+                # single-RPC columnar batch instead of per-point structs
+                batch = Batch(
+                    ids=[str(uuid.uuid4()) for _ in batch_texts],
+                    vectors=vectors[i:i+batch_size].tolist(),
+                    payloads=[{"text": txt, **meta} for txt, meta in zip(batch_texts, batch_meta)]
+                )
+                futures.append(pool.submit(qdrant.upsert, collection_name=self.collection, points=batch))
+            for future in futures:
+                future.result()
 
     @api_retry
     def search(self, query_text, top_k=5):
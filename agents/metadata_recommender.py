@@ -1,6 +1,7 @@
 # agents/metadata_recommender.py
 import json
 import re
+from functools import lru_cache
 
 def suggest(repo_summary):
     readme = repo_summary.get("readme", "")
@@ -73,8 +74,9 @@ def generate_summary(readme, project_type):
         return f"{project_type} project"
 
 def generate_tags(readme, project_type, langs, deps):
-    tags = set()
-    
+    # dict keys as an ordered set: first-seen order survives into the output
+    tags = {}
+
     project_type_tags = {
         "python": ["python", "library"],
         "javascript": ["javascript", "nodejs", "web"],
@@ -85,7 +87,7 @@ def generate_tags(readme, project_type, langs, deps):
     
     for lang, tag_list in project_type_tags.items():
         if lang in project_type.lower():
-            tags.update(tag_list)
+            tags.update(dict.fromkeys(tag_list))
     
     readme_lower = readme.lower()
     common_tags = {
@@ -101,22 +103,23 @@ def generate_tags(readme, project_type, langs, deps):
     
     for tag, keywords in common_tags.items():
         if any(kw in readme_lower for kw in keywords):
-            tags.add(tag)
-    
+            tags[tag] = None
+
     for dep_list in deps.values():
         for dep in dep_list[:3]:
             dep_lower = dep.lower()
             if dep_lower in ["django", "flask", "fastapi"]:
-                tags.add("web-framework")
+                tags["web-framework"] = None
             elif dep_lower in ["numpy", "pandas", "scikit-learn"]:
-                tags.add("data-science")
+                tags["data-science"] = None
             elif dep_lower in ["tensorflow", "pytorch", "keras"]:
-                tags.add("ml")
+                tags["ml"] = None
             else:
-                tags.add(dep_lower.replace("-", "")[:15])
-    
+                tags[dep_lower.replace("-", "")[:15]] = None
+
     return list(tags)[:8]
 
+@lru_cache(maxsize=32)
 def extract_project_name(readme):
     first_line = readme.split("\n")[0].replace("#", "").strip()
     if first_line:
@@ -1,19 +1,89 @@
 # agents/qa_agent.py
-from config.config import co
+import time
+import uuid
+import hashlib
+from qdrant_client.models import VectorParams, Distance, PointStruct
+from config.config import co, qdrant, QDRANT_COLLECTION, EMBEDDING_DIM
 from agents.embedding_agent import EmbeddingAgent
 
+CACHE_SIMILARITY_THRESHOLD = 0.92
+CACHE_TTL_SECONDS = 24 * 3600
+
 class QAAgent:
     def __init__(self):
         self.emb = EmbeddingAgent()
+        self.cache_collection = f"{QDRANT_COLLECTION}_qa_cache"
+        self._ensure_cache_collection()
+
+    def _ensure_cache_collection(self):
+        try:
+            collections = [c.name for c in qdrant.get_collections().collections]
+            if self.cache_collection not in collections:
+                qdrant.create_collection(
+                    collection_name=self.cache_collection,
+                    vectors_config=VectorParams(size=EMBEDDING_DIM, distance=Distance.COSINE)
+                )
+        except Exception:
+            pass
+
+    def _cache_lookup(self, query, query_vec):
+        """Return a cached answer for an identical or semantically similar query, or None."""
+        query_hash = hashlib.sha256(query.encode()).hexdigest()
+        try:
+            hits = qdrant.search(
+                collection_name=self.cache_collection,
+                query_vector=query_vec,
+                limit=1,
+                append_payload=True
+            )
+        except Exception:
+            return None
+        for h in hits:
+            payload = h.payload or {}
+            if time.time() - payload.get("cached_at", 0) > CACHE_TTL_SECONDS:
+                continue
+            # exact-match fast path, then semantic match above the threshold
+            if payload.get("query_hash") == query_hash:
+                return payload.get("answer")
+            score = getattr(h, "score", None)
+            if score is not None and score >= CACHE_SIMILARITY_THRESHOLD:
+                return payload.get("answer")
+        return None
+
+    def _cache_store(self, query, query_vec, answer):
+        try:
+            qdrant.upsert(
+                collection_name=self.cache_collection,
+                points=[PointStruct(
+                    id=str(uuid.uuid4()),
+                    vector=list(query_vec),
+                    payload={
+                        "query": query,
+                        "query_hash": hashlib.sha256(query.encode()).hexdigest(),
+                        "answer": answer,
+                        "cached_at": time.time()
+                    }
+                )]
+            )
+        except Exception:
+            pass
 
     def answer(self, query, top_k=5):
+        query_vec = self.emb._embed_with_jina([query])[0]
+
+        cached = self._cache_lookup(query, query_vec)
+        if cached is not None:
+            return cached
+
         hits = self.emb.search(query, top_k=top_k)
         context = "\n\n".join([h["payload"].get("text","") for h in hits])
         prompt = f"Using the context below, answer the question concisely.\n\nContext:\n{context}\n\nQuestion: {query}\n\nAnswer:"
-        
+
         resp = co.chat(
             message=prompt,
             model="command-a-03-2025",
             max_tokens=300
         )
-        return resp.text.strip()
+        answer = resp.text.strip()
+        self._cache_store(query, query_vec, answer)
+        return answer
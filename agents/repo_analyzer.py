@@ -1,8 +1,110 @@
 # agents/repo_analyzer.py
-from tools.file_loader import load_files_from_directory, extract_zip_to_dir
+from tools.file_loader import iter_files_from_directory, extract_zip_to_dir
 import os
-import json
 import re
+from collections import Counter
+from queue import Queue
+from threading import Thread
+
+try:
+    import orjson as json  # C JSON parser, 2-6x faster on large manifests
+except ImportError:
+    import json
+
+# Precompiled keyword patterns scanned over all paths joined with newlines,
+# instead of K separate `any("kw" in p for p in paths)` Python loops.
+# Prefix-style checks anchor on line start via re.MULTILINE.
+_PATH_KEYWORDS = {
+    "python_config": r"setup\.py|pyproject\.toml|requirements\.txt",
+    "package_json": r"package\.json",
+    "jvm_config": r"pom\.xml|build\.gradle",
+    "go_mod": r"go\.mod",
+    "cargo_toml": r"cargo\.toml",
+    "csharp": r"\.cs",
+    "src": r"^src/|^lib/",
+    "tests": r"test",
+    "docs_dir": r"^docs/|^documentation/",
+    "examples_dir": r"^examples/|^sample/",
+    "docker": r"dockerfile|docker-compose",
+    "dockerfile": r"dockerfile",
+    "ci": r"\.github/workflows|\.gitlab-ci|\.travis|jenkinsfile",
+    "ci_any": r"\.github|\.gitlab-ci|\.travis",
+    "license": r"license",
+    "contributing": r"contribut",
+    "conduct": r"conduct",
+    "doc": r"doc",
+    "example": r"example|sample",
+    "gitignore": r"\.gitignore",
+    "changelog": r"changelog|history",
+    "security": r"security",
+    "pr_template": r"pull_request_template",
+    "issue_template": r"issue_template",
+}
+
+_PATH_SCAN_PATTERNS = {
+    name: re.compile(pattern, re.MULTILINE) for name, pattern in _PATH_KEYWORDS.items()
+}
+
+# Manifest-format patterns: one C-level findall over the whole file instead
+# of per-line Python split/strip loops.
+_REQ_RE = re.compile(r"^[ \t]*([A-Za-z0-9_\-.\[\]]+)", re.MULTILINE)
+_GEM_RE = re.compile(r"^\s*gem\s+['\"]([^'\"]+)", re.MULTILINE)
+_GO_MOD_RE = re.compile(r"^[ \t]*([^\s/][^\s]*)", re.MULTILINE)
+_TOML_KEY_RE = re.compile(r"^([A-Za-z0-9_\-]+)\s*=", re.MULTILINE)
+
+_BADGE_RE = re.compile(r"badge|build|coverage", re.IGNORECASE)
+
+# Readme keywords used by this module plus the reviewer/content-improver
+# section checks; scanned once so every consumer shares the same hit set.
+README_KEYWORDS = (
+    "install", "setup", "getting started", "usage", "quickstart",
+    "how to use", "how", "feature", "capabilities", "contribut", "guidelines",
+    "licens", "license", "api", "documentation", "example",
+)
+
+_WORD_RE = re.compile(r"[a-z]+")
+
+def scan_readme_sections(readme):
+    """Lowercase the readme once and collect which section keywords occur.
+
+    The readme is tokenized into a word set first: keywords that appear as
+    whole words resolve with an O(1) set lookup, and only prefixes/phrases
+    that miss ("contribut", "getting started") fall back to a substring scan.
+    """
+    readme_lower = readme.lower()
+    tokens = set(_WORD_RE.findall(readme_lower))
+    return {kw for kw in README_KEYWORDS if kw in tokens or kw in readme_lower}
+
+def scan_path_keywords(paths):
+    """Scan all (lowercased) paths once per keyword, collecting which ones occur."""
+    joined = "\n".join(paths)
+    return {name for name, rx in _PATH_SCAN_PATTERNS.items() if rx.search(joined)}
+
+_PREFETCH_END = object()
+
+def _prefetch(iterable, maxsize=64):
+    """Drain `iterable` from a background thread through a bounded queue.
+
+    File reads are I/O-bound and the per-file bookkeeping below is CPU-bound;
+    producing ahead lets the two overlap instead of strictly alternating.
+    """
+    queue = Queue(maxsize=maxsize)
+    errors = []
+
+    def produce():
+        try:
+            for item in iterable:
+                queue.put(item)
+        except Exception as e:
+            errors.append(e)
+        finally:
+            queue.put(_PREFETCH_END)
+
+    Thread(target=produce, daemon=True).start()
+    while (item := queue.get()) is not _PREFETCH_END:
+        yield item
+    if errors:
+        raise errors[0]
 
 def analyze_repo(path_or_zip: str, workdir="./temp_repo"):
     if path_or_zip.endswith(".zip") or (os.path.isfile(path_or_zip) and path_or_zip.lower().endswith(".zip")):
@@ -11,37 +113,59 @@ def analyze_repo(path_or_zip: str, workdir="./temp_repo"):
     else:
         repo_dir = path_or_zip
 
-    files = load_files_from_directory(repo_dir)
-    print(f"[DEBUG] Loaded {len(files)} files from {repo_dir}")
-    
-    readme = next((f["content"] for f in files if f["path"].lower().startswith("readme")), "")
-    readme_path = next((f["path"] for f in files if f["path"].lower().startswith("readme")), None)
-    
-    langs = {}
-    for f in files:
+    # Single streaming pass: collect everything that previously took its own
+    # iteration (readme lookup, language tally, path set, content map, size)
+    # while the file list is materialized. The streaming loader keeps disk
+    # reads in the prefetch thread overlapping the analysis below; the
+    # materializing loader would finish all I/O before the loop started.
+    files = []
+    langs = Counter()
+    paths_lower = set()
+    content_map = {}
+    readme = ""
+    readme_path = None
+    repo_size = 0
+
+    for f in _prefetch(iter_files_from_directory(repo_dir)):
+        files.append(f)
+        path_lower = f["path"].lower()
+        paths_lower.add(path_lower)
+        content_map[path_lower] = f["content"]
+        repo_size += f.get("size", 0)
+
         ext = os.path.splitext(f["path"])[1]
         if ext:
-            langs[ext] = langs.get(ext, 0) + 1
-    
+            langs[ext] += 1
+
+        if readme_path is None and path_lower.startswith("readme"):
+            readme = f["content"]
+            readme_path = f["path"]
+
+    print(f"[DEBUG] Loaded {len(files)} files from {repo_dir}")
+
+    found = scan_path_keywords(paths_lower)
+    readme_sections = scan_readme_sections(readme)
+
     dependencies = extract_dependencies(files)
-    missing_sections = check_missing_sections(files, readme)
-    project_type = detect_project_type(files, langs)
-    repo_structure = analyze_structure(files, repo_dir)
-    best_practices = check_best_practices(files)
+    missing_sections = check_missing_sections(files, readme, found=found, sections=readme_sections)
+    project_type = detect_project_type(files, langs, found=found)
+    repo_structure = analyze_structure(files, repo_dir, found=found)
+    best_practices = check_best_practices(files, content_map=content_map, found=found)
     
     return {
         "repo_dir": repo_dir,
         "files": files,
         "readme": readme,
         "readme_path": readme_path,
+        "readme_sections": readme_sections,
         "langs": langs,
         "dependencies": dependencies,
         "missing": missing_sections,
         "project_type": project_type,
         "structure": repo_structure,
         "best_practices": best_practices,
-        "total_files": len(repo_structure.get("files", [])),
-        "repo_size": sum(f.get("size", 0) for f in files)
+        "total_files": len(repo_structure.get("paths", [])),
+        "repo_size": repo_size
     }
 
 def extract_dependencies(files):
@@ -52,7 +176,7 @@ def extract_dependencies(files):
         content = f["content"]
         
         if path == "requirements.txt":
-            deps["python"].extend([line.split("==")[0].split(">")[0].strip() for line in content.split("\n") if line.strip() and not line.startswith("#")])
+            deps["python"].extend(_REQ_RE.findall(content))
         elif path == "setup.py" or path == "pyproject.toml":
             deps["python"].extend(extract_python_deps(content))
         elif path == "package.json":
@@ -61,13 +185,14 @@ def extract_dependencies(files):
                 deps["node"].extend(list(pkg.get("dependencies", {}).keys())[:10])
             except: pass
         elif path == "gemfile":
-            deps["ruby"].extend([line.split()[1].strip("'\"") for line in content.split("\n") if line.strip().startswith("gem")])
+            deps["ruby"].extend(_GEM_RE.findall(content))
         elif path == "go.mod":
-            deps["go"].extend([line.split()[0] for line in content.split("\n") if line.strip() and not line.startswith("//")])
+            deps["go"].extend(_GO_MOD_RE.findall(content))
         elif path == "cargo.toml":
             deps["rust"].extend(extract_toml_deps(content))
     
-    return {k: list(set(v))[:5] for k, v in deps.items() if v}
+    # ordered first-seen dedup keeps output deterministic for cache keys
+    return {k: list(dict.fromkeys(v))[:5] for k, v in deps.items() if v}
 
 def extract_python_deps(content):
     deps = []
@@ -80,31 +205,25 @@ def extract_python_deps(content):
     return deps
 
 def extract_toml_deps(content):
-    deps = []
-    for line in content.split("\n"):
-        if "=" in line and not line.startswith("["):
-            try:
-                key = line.split("=")[0].strip()
-                deps.append(key)
-            except: pass
-    return deps
+    return _TOML_KEY_RE.findall(content)
 
-def detect_project_type(files, langs):
-    paths = {f["path"].lower() for f in files}
-    
-    if any("setup.py" in p or "pyproject.toml" in p or "requirements.txt" in p for p in paths):
+def detect_project_type(files, langs, found=None):
+    if found is None:
+        found = scan_path_keywords({f["path"].lower() for f in files})
+
+    if "python_config" in found:
         return "Python Library"
-    elif any("package.json" in p for p in paths):
+    elif "package_json" in found:
         return "Node.js/JavaScript"
-    elif any("pom.xml" in p or "build.gradle" in p for p in paths):
+    elif "jvm_config" in found:
         return "Java/JVM"
-    elif any("go.mod" in p for p in paths):
+    elif "go_mod" in found:
         return "Go"
-    elif any("cargo.toml" in p for p in paths):
+    elif "cargo_toml" in found:
         return "Rust"
-    elif any(".cs" in p or ".csproj" in p for p in paths):
+    elif "csharp" in found:
         return "C# / .NET"
-    elif any("dockerfile" in p for p in paths):
+    elif "dockerfile" in found:
         return "Docker/Container"
     else:
         if langs.get(".py", 0) > langs.get(".js", 0):
@@ -114,8 +233,11 @@ def detect_project_type(files, langs):
         else:
             return "Unknown"
 
-def analyze_structure(files, repo_dir):
+def analyze_structure(files, repo_dir=None, found=None):
     """Analyze the complete repository structure"""
+    # File listing is parallel arrays (paths/sizes) rather than one dict per
+    # file: name and extension are derivable from the path, and the flat
+    # lists are far cheaper to store and serialize for large repos.
     structure = {
         "has_src": False,
         "has_tests": False,
@@ -124,40 +246,34 @@ def analyze_structure(files, repo_dir):
         "has_docker": False,
         "has_ci": False,
         "directory_tree": build_directory_tree(files),
-        "files": [],
+        "paths": [],
+        "sizes": [],
         "directories": []
     }
     
-    paths = {f["path"].lower() for f in files}
-    
-    structure["has_src"] = any(p.startswith("src/") or p.startswith("lib/") for p in paths)
-    structure["has_tests"] = any("test" in p for p in paths)
-    structure["has_docs"] = any(p.startswith("docs/") or p.startswith("documentation/") for p in paths)
-    structure["has_examples"] = any(p.startswith("examples/") or p.startswith("sample/") for p in paths)
-    structure["has_docker"] = any("dockerfile" in p or "docker-compose" in p for p in paths)
-    structure["has_ci"] = any(".github/workflows" in p or ".gitlab-ci" in p or ".travis" in p or "jenkinsfile" in p for p in paths)
+    if found is None:
+        found = scan_path_keywords({f["path"].lower() for f in files})
+
+    structure["has_src"] = "src" in found
+    structure["has_tests"] = "tests" in found
+    structure["has_docs"] = "docs_dir" in found
+    structure["has_examples"] = "examples_dir" in found
+    structure["has_docker"] = "docker" in found
+    structure["has_ci"] = "ci" in found
     
     # Build files and directories list
     processed_dirs = set()
     for file in files:
         path = file["path"]
-        name = os.path.basename(path)
-        ext = os.path.splitext(path)[1]
-        
-        structure["files"].append({
-            "path": path,
-            "name": name,
-            "extension": ext,
-            "size": file.get("size", 0),
-            "content_length": file.get("content_size", 0)
-        })
-        
+        structure["paths"].append(path)
+        structure["sizes"].append(file.get("size", 0))
+
         # Extract directories
         dir_path = os.path.dirname(path)
         if dir_path and dir_path not in processed_dirs:
             structure["directories"].append(dir_path)
             processed_dirs.add(dir_path)
-    
+
     return structure
 
 def build_directory_tree(files):
@@ -184,40 +300,43 @@ def build_directory_tree(files):
     print(f"[DEBUG] directory_tree built with {len(tree)} root items")
     return tree
 
-def check_missing_sections(files, readme):
-    paths = {f["path"].lower() for f in files}
+def check_missing_sections(files, readme, found=None, sections=None):
+    if found is None:
+        found = scan_path_keywords({f["path"].lower() for f in files})
+    if sections is None:
+        sections = scan_readme_sections(readme)
     missing = []
-    
+
     checks = {
-        "LICENSE": any("license" in p for p in paths),
-        "CONTRIBUTING.md": any("contribut" in p for p in paths),
-        "CODE_OF_CONDUCT.md": any("conduct" in p for p in paths),
-        "Tests": any("test" in p for p in paths),
-        "Documentation": any("doc" in p for p in paths),
-        "Examples": any("example" in p or "sample" in p for p in paths),
-        "CI/CD": any(".github" in p or ".gitlab-ci" in p or ".travis" in p for p in paths),
-        ".gitignore": any(".gitignore" in p for p in paths),
+        "LICENSE": "license" in found,
+        "CONTRIBUTING.md": "contributing" in found,
+        "CODE_OF_CONDUCT.md": "conduct" in found,
+        "Tests": "tests" in found,
+        "Documentation": "doc" in found,
+        "Examples": "example" in found,
+        "CI/CD": "ci_any" in found,
+        ".gitignore": "gitignore" in found,
     }
-    
-    readme_sections = {
-        "Installation": "install" in readme.lower(),
-        "Usage": "usage" in readme.lower() or "how to use" in readme.lower(),
-        "Features": "feature" in readme.lower() or "capabilities" in readme.lower(),
-        "Contributing": "contribut" in readme.lower(),
-        "License": "license" in readme.lower() or "licens" in readme.lower()
+
+    readme_checks = {
+        "Installation": "install" in sections,
+        "Usage": "usage" in sections or "how to use" in sections,
+        "Features": "feature" in sections or "capabilities" in sections,
+        "Contributing": "contribut" in sections,
+        "License": "licens" in sections
     }
     
     for section, exists in checks.items():
         if not exists:
             missing.append(f"Missing: {section}")
     
-    for section, exists in readme_sections.items():
+    for section, exists in readme_checks.items():
         if readme and not exists:
             missing.append(f"README missing: {section} section")
     
     return missing
 
-def check_best_practices(files):
+def check_best_practices(files, content_map=None, found=None):
     practices = {
         "has_changelog": False,
         "has_security_policy": False,
@@ -227,18 +346,21 @@ def check_best_practices(files):
         "has_badges": False
     }
     
-    paths = {f["path"].lower() for f in files}
-    content_map = {f["path"].lower(): f["content"] for f in files}
-    
-    practices["has_changelog"] = any("changelog" in p or "history" in p for p in paths)
-    practices["has_security_policy"] = any("security" in p for p in paths)
-    practices["has_pull_request_template"] = any("pull_request_template" in p for p in paths)
-    practices["has_issue_templates"] = any("issue_template" in p for p in paths)
-    practices["has_code_of_conduct"] = any("conduct" in p for p in paths)
+    if content_map is None:
+        content_map = {f["path"].lower(): f["content"] for f in files}
+    if found is None:
+        found = scan_path_keywords(content_map.keys())
+
+    practices["has_changelog"] = "changelog" in found
+    practices["has_security_policy"] = "security" in found
+    practices["has_pull_request_template"] = "pr_template" in found
+    practices["has_issue_templates"] = "issue_template" in found
+    practices["has_code_of_conduct"] = "conduct" in found
     
-    for p, content in content_map.items():
-        if "readme" in p and ("badge" in content or "build" in content or "coverage" in content):
+    # one compiled scan per README instead of three substring passes
+    for f in files:
+        if "readme" in f["path"].lower() and _BADGE_RE.search(f["content"]):
             practices["has_badges"] = True
             break
-    
+
     return practices
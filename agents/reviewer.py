@@ -1,10 +1,174 @@
 # agents/reviewer.py
+import json
+from dataclasses import dataclass, asdict
+from heapq import nsmallest
+from itertools import islice
+from operator import attrgetter
+from agents.repo_analyzer import scan_readme_sections
+
+# Section name -> keyword tokens; matched against the single-pass readme scan
+# so each README is swept once instead of once per keyword.
+# Issue severity is carried as an int alongside the message; the emoji prefix
+# is attached only when formatting for display, so classification is an integer
+# compare instead of a multi-byte substring scan.
+CRIT, WARN = 0, 1
+
+_SEVERITY_PREFIX = {CRIT: "❌ ", WARN: "⚠️  "}
+
+# Prefix built once; "💡 " + text avoids re-encoding the emoji per f-string
+_TIP = "💡 "
+
+# Recommendation kinds: like issue severities, recommendations are carried as
+# (kind, text) tuples internally so downstream dispatch is an int compare
+# instead of substring matching; the bare text goes out at the boundary.
+REC_TIP, REC_CI, REC_CHANGELOG, REC_PR_TEMPLATE, REC_BADGES = range(5)
+
+# Static recommendations with their trigger conditions, evaluated in one loop
+# over prebuilt strings instead of four branches each building an f-string.
+_CONDITIONAL_RECS = (
+    (lambda c, bp: not c["has_ci"],
+     (REC_CI, _TIP + "Add CI/CD pipeline (GitHub Actions, GitLab CI) to automate testing")),
+    (lambda c, bp: not bp.get("has_changelog"),
+     (REC_CHANGELOG, _TIP + "Add CHANGELOG to track version history")),
+    (lambda c, bp: not bp.get("has_pull_request_template"),
+     (REC_PR_TEMPLATE, _TIP + "Add PR template to maintain code quality standards")),
+    (lambda c, bp: not bp.get("has_badges"),
+     (REC_BADGES, _TIP + "Add badges (build status, coverage, downloads) for credibility")),
+)
+
+# Issue-topic flags, set once while issues are classified; downstream helpers
+# test bits instead of re-scanning every message.
+FLAG_README, FLAG_LICENSE, FLAG_TESTS = 1, 2, 4
+
+def format_issue(issue):
+    severity, message = issue
+    return _SEVERITY_PREFIX[severity] + message
+
+SECTION_TOKENS = {
+    "Installation": ("install", "setup", "getting started"),
+    "Usage": ("usage", "quickstart", "example"),
+    "Features": ("feature", "capabilities"),
+    "Contributing": ("contribut", "guidelines"),
+    "License": ("license",),
+    "API Reference": ("api", "documentation"),
+}
+
+# Inverted index: matched readme keywords map straight to their section, so
+# present-section discovery walks the (small) hit set once instead of testing
+# every section x token combination.
+_TOKEN_TO_SECTION = {
+    tok: sec for sec, tokens in SECTION_TOKENS.items() for tok in tokens
+}
+
+# review() is pure in its inputs but gets re-invoked with identical data on
+# every UI rerun; memoize on the fields it actually reads (keying on the full
+# repo_summary would serialize every file body and cost more than the review).
+_REVIEW_CACHE = {}
+_REVIEW_CACHE_MAX = 64
+
+# Slotted, frozen result types: attribute access beats dict hashing, the
+# instances are materially smaller, and immutability lets the memo cache hand
+# the same object to every caller without defensive copies. Serialize with
+# ReviewResult.as_dict() at JSON boundaries.
+# Priorities are ints so selection/sorting compares integers; the display
+# label is an O(1) table lookup at the serialization boundary.
+P0, P1, P2, P3 = range(4)
+_PRIORITY_LABELS = ("P0 - CRITICAL", "P1 - HIGH", "P2 - MEDIUM", "P3 - LOW")
+
+@dataclass(slots=True, frozen=True)
+class ActionItem:
+    priority: int
+    task: str
+    details: str
+
+    @property
+    def priority_label(self):
+        return _PRIORITY_LABELS[self.priority]
+
+@dataclass(slots=True, frozen=True)
+class ValidationResults:
+    critical_issues: int
+    warnings: int
+    recommendations_count: int
+    missing_readme_sections: tuple
+    completeness: dict
+    overall_health: int
+
+@dataclass(slots=True, frozen=True)
+class ReviewResult:
+    issues: tuple
+    recommendations: tuple
+    validation_results: ValidationResults
+    action_items: tuple
+    priority_fixes: tuple
+
+    def as_dict(self):
+        d = asdict(self)
+        d["action_items"] = tuple(
+            {**a, "priority": _PRIORITY_LABELS[a["priority"]]}
+            for a in d["action_items"]
+        )
+        return d
+
+# Canonical action items, built once at import; generate_action_items appends
+# references instead of reconstructing identical objects per call.
+_ACTION_README = ActionItem(
+    priority=P0,
+    task="Create comprehensive README.md",
+    details="Include features, installation, usage, and contribution guidelines"
+)
+_ACTION_LICENSE = ActionItem(
+    priority=P1,
+    task="Add LICENSE file",
+    details="Choose appropriate license (MIT, Apache 2.0, GPL, etc.)"
+)
+_ACTION_TESTS = ActionItem(
+    priority=P1,
+    task="Add test suite",
+    details="Create tests folder with unit and integration tests"
+)
+_ACTION_CI = ActionItem(
+    priority=P2,
+    task="Set up CI/CD pipeline",
+    details="Use GitHub Actions, GitLab CI, or similar"
+)
+_ACTION_BADGES = ActionItem(
+    priority=P3,
+    task="Add status badges",
+    details="Build status, coverage, downloads badges"
+)
 
 def review(repo_summary, improved_data):
+    try:
+        key = json.dumps(
+            (
+                repo_summary.get("readme", ""),
+                repo_summary.get("structure", {}),
+                repo_summary.get("missing", []),
+                repo_summary.get("best_practices", {}),
+                sorted(repo_summary.get("readme_sections") or ()),
+                improved_data,
+            ),
+            sort_keys=True, default=str
+        )
+    except TypeError:
+        key = None
+
+    if key is not None and key in _REVIEW_CACHE:
+        return _REVIEW_CACHE[key]
+
+    result = _review(repo_summary, improved_data)
+
+    if key is not None:
+        if len(_REVIEW_CACHE) >= _REVIEW_CACHE_MAX:
+            _REVIEW_CACHE.pop(next(iter(_REVIEW_CACHE)))
+        _REVIEW_CACHE[key] = result
+    return result
+
+def _review(repo_summary, improved_data):
     issues = []
     recommendations = []
-    completeness_checks = {}
-    
+
     readme = repo_summary.get("readme", "")
     structure = repo_summary.get("structure", {})
     missing = repo_summary.get("missing", [])
@@ -13,137 +177,129 @@ def review(repo_summary, improved_data):
     dependencies = repo_summary.get("dependencies", {})
     
     if not readme:
-        issues.append("❌ No README found - this is critical for project visibility")
-    
-    if improved_data:
-        if isinstance(improved_data, dict):
-            improvements_list = improved_data.get("improvements", [])
-            quality_score = improved_data.get("quality_score", 50)
-        else:
-            improvements_list = []
-            quality_score = 50
-        
-        if improvements_list:
-            for improvement in improvements_list[:3]:
-                recommendations.append(f"💡 {improvement}")
-    
-    completeness_checks["has_license"] = any("license" in str(m).lower() for m in missing) == False
-    completeness_checks["has_tests"] = structure.get("has_tests", False)
-    completeness_checks["has_docs"] = structure.get("has_docs", False)
-    completeness_checks["has_examples"] = structure.get("has_examples", False)
-    completeness_checks["has_ci"] = structure.get("has_ci", False)
-    completeness_checks["has_contributing"] = any("contribut" in str(m).lower() for m in missing) == False
-    
-    if not completeness_checks["has_license"]:
-        issues.append("⚠️  No LICENSE file - add to clarify usage rights")
-    
-    if not completeness_checks["has_tests"]:
-        issues.append("⚠️  No tests found - add test suite for credibility")
-    
-    if not completeness_checks["has_contributing"]:
-        issues.append("⚠️  No CONTRIBUTING.md - make it easy for contributors to help")
-    
-    if not completeness_checks["has_ci"]:
-        recommendations.append("💡 Add CI/CD pipeline (GitHub Actions, GitLab CI) to automate testing")
+        issues.append((CRIT, "No README found - this is critical for project visibility"))
     
-    if not best_practices.get("has_changelog"):
-        recommendations.append("💡 Add CHANGELOG to track version history")
+    # one shape check, then an islice view instead of a [:3] copy
+    if isinstance(improved_data, dict):
+        for improvement in islice(improved_data.get("improvements", ()), 3):
+            recommendations.append((REC_TIP, _TIP + improvement))
     
-    if not best_practices.get("has_pull_request_template"):
-        recommendations.append("💡 Add PR template to maintain code quality standards")
-    
-    if not best_practices.get("has_badges"):
-        recommendations.append("💡 Add badges (build status, coverage, downloads) for credibility")
-    
-    readme_lower = readme.lower()
-    
-    section_checks = {
-        "Installation": "install" in readme_lower or "setup" in readme_lower or "getting started" in readme_lower,
-        "Usage": "usage" in readme_lower or "quickstart" in readme_lower or "example" in readme_lower,
-        "Features": "feature" in readme_lower or "capabilities" in readme_lower,
-        "Contributing": "contribut" in readme_lower or "guidelines" in readme_lower,
-        "License": "license" in readme_lower,
-        "API Reference": "api" in readme_lower or "documentation" in readme_lower
+    # lowercase the missing list once; both membership tests hit the same blob
+    missing_blob = " ".join(str(m).lower() for m in missing)
+
+    # hoist each flag into a local: one dict hash per key instead of one per
+    # use site below
+    has_license = "license" not in missing_blob
+    has_contributing = "contribut" not in missing_blob
+    has_tests = structure.get("has_tests", False)
+    has_docs = structure.get("has_docs", False)
+    has_examples = structure.get("has_examples", False)
+    has_ci = structure.get("has_ci", False)
+
+    completeness_checks = {
+        "has_license": has_license,
+        "has_tests": has_tests,
+        "has_docs": has_docs,
+        "has_examples": has_examples,
+        "has_ci": has_ci,
+        "has_contributing": has_contributing,
     }
+
+    if not has_license:
+        issues.append((WARN, "No LICENSE file - add to clarify usage rights"))
+
+    if not has_tests:
+        issues.append((WARN, "No tests found - add test suite for credibility"))
+
+    if not has_contributing:
+        issues.append((WARN, "No CONTRIBUTING.md - make it easy for contributors to help"))
     
-    missing_sections = [sec for sec, exists in section_checks.items() if not exists]
-    
-    validation_results = {
-        "critical_issues": len([i for i in issues if "❌" in i]),
-        "warnings": len([i for i in issues if "⚠️" in i]),
-        "recommendations_count": len(recommendations),
-        "missing_readme_sections": missing_sections,
-        "completeness": completeness_checks,
-        "overall_health": calculate_health_score(issues, recommendations, completeness_checks)
-    }
+    for condition, rec in _CONDITIONAL_RECS:
+        if condition(completeness_checks, best_practices):
+            recommendations.append(rec)
     
-    return {
-        "issues": issues,
-        "recommendations": recommendations,
-        "validation_results": validation_results,
-        "action_items": generate_action_items(issues, recommendations),
-        "priority_fixes": get_priority_fixes(issues, missing_sections)
-    }
+    if not readme:
+        # no README means every section is trivially missing; skip the scan
+        missing_sections = list(SECTION_TOKENS)
+    else:
+        sections = repo_summary.get("readme_sections")
+        if sections is None:
+            sections = scan_readme_sections(readme)
 
-def calculate_health_score(issues, recommendations, completeness):
-    score = 100
-    score -= len([i for i in issues if "❌" in i]) * 20
-    score -= len([i for i in issues if "⚠️" in i]) * 10
-    score -= len(recommendations) * 5
-    
-    if not completeness.get("has_license"):
-        score -= 15
-    if not completeness.get("has_tests"):
-        score -= 10
-    if not completeness.get("has_docs"):
-        score -= 5
+        present = {
+            _TOKEN_TO_SECTION[tok]
+            for tok in sections if tok in _TOKEN_TO_SECTION
+        }
+        # ordered filter against the present set keeps output deterministic
+        missing_sections = [sec for sec in SECTION_TOKENS if sec not in present]
     
-    return max(0, min(100, score))
+    # classify each issue once; the counts feed validation_results and the
+    # health score, and the flags bitmap replaces the repeated substring
+    # scans generate_action_items/get_priority_fixes used to do themselves
+    critical_count = warning_count = 0
+    flags = 0
+    for severity, msg in issues:
+        if severity == CRIT:
+            critical_count += 1
+        else:
+            warning_count += 1
+        if "README" in msg:
+            flags |= FLAG_README
+        if "LICENSE" in msg:
+            flags |= FLAG_LICENSE
+        if "tests" in msg:
+            flags |= FLAG_TESTS
 
-def generate_action_items(issues, recommendations):
+    validation_results = ValidationResults(
+        critical_issues=critical_count,
+        warnings=warning_count,
+        recommendations_count=len(recommendations),
+        missing_readme_sections=tuple(missing_sections),
+        completeness=completeness_checks,
+        overall_health=calculate_health_score(critical_count, warning_count, recommendations, completeness_checks)
+    )
+
+    return ReviewResult(
+        issues=tuple(format_issue(i) for i in issues),
+        recommendations=tuple(text for _, text in recommendations),
+        validation_results=validation_results,
+        action_items=tuple(generate_action_items(flags, recommendations)),
+        priority_fixes=tuple(get_priority_fixes(flags, missing_sections))
+    )
+
+# completeness keys and their score penalties, walked in one pass
+_COMPLETENESS_PENALTIES = (("has_license", 15), ("has_tests", 10), ("has_docs", 5))
+
+def calculate_health_score(critical_count, warning_count, recommendations, completeness):
+    penalty = sum(w for k, w in _COMPLETENESS_PENALTIES if not completeness.get(k))
+    return max(0, min(100, 100 - critical_count * 20 - warning_count * 10
+                      - len(recommendations) * 5 - penalty))
+
+def generate_action_items(flags, recommendations):
     actions = []
-    
-    if any("No README" in i for i in issues):
-        actions.append({
-            "priority": "P0 - CRITICAL",
-            "task": "Create comprehensive README.md",
-            "details": "Include features, installation, usage, and contribution guidelines"
-        })
-    
-    if any("No LICENSE" in i for i in issues):
-        actions.append({
-            "priority": "P1 - HIGH",
-            "task": "Add LICENSE file",
-            "details": "Choose appropriate license (MIT, Apache 2.0, GPL, etc.)"
-        })
-    
-    if any("No tests" in i for i in issues):
-        actions.append({
-            "priority": "P1 - HIGH",
-            "task": "Add test suite",
-            "details": "Create tests folder with unit and integration tests"
-        })
-    
-    for rec in recommendations[:3]:
-        if "CI/CD" in rec:
-            actions.append({
-                "priority": "P2 - MEDIUM",
-                "task": "Set up CI/CD pipeline",
-                "details": "Use GitHub Actions, GitLab CI, or similar"
-            })
-        elif "badges" in rec:
-            actions.append({
-                "priority": "P3 - LOW",
-                "task": "Add status badges",
-                "details": "Build status, coverage, downloads badges"
-            })
-    
-    return actions[:5]
 
-def get_priority_fixes(issues, missing_sections):
-    if any("No README" in i for i in issues):
+    if flags & FLAG_README:
+        actions.append(_ACTION_README)
+
+    if flags & FLAG_LICENSE:
+        actions.append(_ACTION_LICENSE)
+
+    if flags & FLAG_TESTS:
+        actions.append(_ACTION_TESTS)
+
+    for kind, _ in islice(recommendations, 3):
+        if kind == REC_CI:
+            actions.append(_ACTION_CI)
+        elif kind == REC_BADGES:
+            actions.append(_ACTION_BADGES)
+
+    # top five by priority (stable for ties), not by insertion order
+    return nsmallest(5, actions, key=attrgetter("priority"))
+
+def get_priority_fixes(flags, missing_sections):
+    if flags & FLAG_README:
         return ["Create README.md", "Add Installation section", "Add Usage examples"]
-    elif any("No LICENSE" in i for i in issues):
+    elif flags & FLAG_LICENSE:
         return ["Add LICENSE file", "Create CONTRIBUTING.md", "Add examples"]
     elif "Installation" in missing_sections:
         return ["Add Installation section", "Add Usage examples", "Add code samples"]
@@ -7,6 +7,18 @@ from dotenv import load_dotenv
 import logging
 from werkzeug.exceptions import RequestEntityTooLarge
 
+try:
+    import orjson  # C codec, several times faster than stdlib json
+except ImportError:
+    orjson = None
+
+from routes.auth import auth_bp
+from routes.projects import projects_bp
+from routes.analysis import analysis_bp
+from routes.generation import generation_bp
+
+__all__ = ["app"]
+
 load_dotenv()
 
 app = Flask(__name__)
@@ -17,6 +29,23 @@ app.config['JWT_ACCESS_TOKEN_EXPIRES'] = timedelta(days=30)
 app.config['MAX_CONTENT_LENGTH'] = 50 * 1024 * 1024  # 50MB max request size
 app.config['JSON_SORT_KEYS'] = False
 
+# Route every jsonify/response through orjson when it's installed: one C-level
+# encode into a single buffer instead of Flask's stdlib json path.
+if orjson is not None:
+    from flask.json.provider import DefaultJSONProvider
+
+    class ORJSONProvider(DefaultJSONProvider):
+        def dumps(self, obj, **kwargs):
+            return orjson.dumps(obj, default=self.default).decode()
+
+        def loads(self, s, **kwargs):
+            return orjson.loads(s)
+
+    app.json = ORJSONProvider(app)
+else:
+    # stdlib fallback: at least skip the pretty-printing whitespace
+    app.json.compact = True
+
 # Setup logging
 logging.basicConfig(
     level=logging.INFO,
@@ -28,12 +57,6 @@ logger = logging.getLogger(__name__)
 CORS(app, resources={r"/api/*": {"origins": "*"}})
 jwt = JWTManager(app)
 
-# Import routes
-from routes.auth import auth_bp
-from routes.projects import projects_bp
-from routes.analysis import analysis_bp
-from routes.generation import generation_bp
-
 # Register blueprints
 app.register_blueprint(auth_bp, url_prefix='/api/auth')
 app.register_blueprint(projects_bp, url_prefix='/api/projects')
@@ -130,8 +153,13 @@ def log_request():
         logger.info(f"[{request.method}] {request.path} from {request.remote_addr}")
 
 if __name__ == '__main__':
-    app.run(
-        host='0.0.0.0',
-        port=int(os.getenv('FLASK_PORT', 5000)),
-        debug=os.getenv('FLASK_ENV', 'production') == 'development'
-    )
+    if os.getenv('FLASK_ENV', 'production') == 'development':
+        app.run(
+            host='0.0.0.0',
+            port=int(os.getenv('FLASK_PORT', 5000)),
+            debug=True
+        )
+    else:
+        # Werkzeug's dev server handles one request at a time; production
+        # serving goes through the pre-forked WSGI setup instead.
+        raise SystemExit("Use: gunicorn -c gunicorn.conf.py wsgi:app")
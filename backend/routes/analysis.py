@@ -3,72 +3,205 @@ from flask_jwt_extended import jwt_required, get_jwt_identity
 import os
 import sys
 import json
+import tempfile
+import uuid
 from datetime import datetime
 
+try:
+    import orjson  # C codec, several times faster than stdlib json
+except ImportError:
+    orjson = None
+
 analysis_bp = Blueprint('analysis', __name__)
 
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+# guarded so reloads under gunicorn --reload don't grow sys.path
+_PROJECT_ROOT = os.path.join(os.path.dirname(__file__), '..', '..')
+if _PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT)
 
-from agents.repo_analyzer import analyze_repo
-from tools.repo_downloader import RepoDownloader
+# The analyzer/downloader stack (and the API clients config pulls in) is only
+# needed by the download endpoint; importing it lazily there keeps app startup
+# and the read-only endpoints from paying the cost.
 from utils.validators import validate_github_url
+from utils import job_store
 
-PROJECTS_FILE = 'backend/data/projects.json'
+# Projects are sharded per user (routes/projects.py splits any legacy
+# single-file store at startup); this module only ever touches one shard.
+# Paths are anchored to this file so they resolve the same under the dev
+# server and under gunicorn, which chdirs into backend/.
+_DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data')
+PROJECTS_DIR = os.path.join(_DATA_DIR, 'projects')
 
-def load_projects():
-    """Load projects"""
-    if not os.path.exists(PROJECTS_FILE):
-        return {}
+def _projects_path(username):
+    return os.path.join(PROJECTS_DIR, f'{username}.json')
+
+# The heavy analysis payload lives in a per-project sidecar file, keyed into
+# the project record as repo_data_path. The shard itself stays small, so
+# listing and saving projects no longer (de)serializes every analysis.
+REPO_DATA_DIR = os.path.join(_DATA_DIR, 'repo_data')
+
+def _repo_data_path(project_id):
+    return os.path.join(REPO_DATA_DIR, f'{project_id}.json')
+
+def save_repo_data(project_id, repo_data):
+    """Write a project's analysis payload to its sidecar (atomic rename)"""
+    os.makedirs(REPO_DATA_DIR, exist_ok=True)
+    if orjson is not None:
+        payload = orjson.dumps(repo_data)
+    else:
+        payload = json.dumps(repo_data, separators=(',', ':')).encode()
+    fd, tmp = tempfile.mkstemp(dir=REPO_DATA_DIR, suffix='.tmp')
     try:
-        with open(PROJECTS_FILE, 'r') as f:
+        os.write(fd, payload)
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+    os.replace(tmp, _repo_data_path(project_id))
+
+def _get_repo_data(project):
+    """Resolve a project's repo_data: inline for legacy records, else the
+    sidecar file named by repo_data_path."""
+    repo_data = project.get('repo_data')
+    if repo_data:
+        return repo_data
+    path = project.get('repo_data_path')
+    if not path or not os.path.exists(path):
+        return None
+    try:
+        if orjson is not None:
+            with open(path, 'rb') as f:
+                return orjson.loads(f.read())
+        with open(path, 'r') as f:
             return json.load(f)
+    except:
+        return None
+
+# Request bodies here are just a URL and a project id; reject anything
+# bigger from Content-Length alone, before the JSON parser reads a byte.
+_MAX_BODY_BYTES = 4096
+
+# Analysis results keyed by (url, head_sha): re-analyzing the same commit is
+# pure recomputation, so repeat requests reuse the stored result. Bounded
+# FIFO so long-running workers don't accumulate file contents indefinitely.
+_ANALYSIS_CACHE = {}
+_ANALYSIS_CACHE_MAX = 16
+
+# Clone+analyze runs on a small worker pool instead of under the request
+# handler, so a WSGI worker isn't pinned for the whole clone. Clients get a
+# job id back immediately and poll /job/<id> (the analysis itself lands in
+# projects.json, so the existing GET endpoints also pick it up). State is
+# written through to the shared job store on every update because under the
+# multi-worker gunicorn config the poll can land on a different process
+# than the one running the job; _JOBS is only this process's fast path.
+_JOB_KIND = 'analysis'
+_JOBS = {}
+_JOBS_MAX = 64
+_EXECUTOR = None
+
+def _update_job(job_id, **fields):
+    job = _JOBS.get(job_id)
+    if job is None:
+        job = _JOBS.setdefault(job_id, {})
+    job.update(fields)
+    job_store.write_job(_JOB_KIND, job_id, job)
+
+def _get_executor():
+    global _EXECUTOR
+    if _EXECUTOR is None:
+        from concurrent.futures import ThreadPoolExecutor
+        _EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix='analysis')
+    return _EXECUTOR
+
+# One downloader per process: reuses its cache directory and clone index
+# instead of re-initializing per request.
+_DOWNLOADER = None
+
+def _get_downloader():
+    global _DOWNLOADER
+    if _DOWNLOADER is None:
+        from tools.repo_downloader import RepoDownloader
+        _DOWNLOADER = RepoDownloader()
+    return _DOWNLOADER
+
+def load_user_projects(username):
+    """Load one user's shard as an id-keyed dict"""
+    path = _projects_path(username)
+    if not os.path.exists(path):
+        return {}
+    try:
+        if orjson is not None:
+            with open(path, 'rb') as f:
+                data = orjson.loads(f.read())
+        else:
+            with open(path, 'r') as f:
+                data = json.load(f)
+        if isinstance(data, list):
+            data = {p['id']: p for p in data}
+        return data
     except:
         return {}
 
-def save_projects(projects):
-    """Save projects"""
-    os.makedirs(os.path.dirname(PROJECTS_FILE), exist_ok=True)
-    with open(PROJECTS_FILE, 'w') as f:
-        json.dump(projects, f, indent=2)
+def save_user_projects(username, user_projects):
+    """Save one user's shard (single-buffer write, atomic rename)"""
+    os.makedirs(PROJECTS_DIR, exist_ok=True)
+    if orjson is not None:
+        payload = orjson.dumps(user_projects)
+    else:
+        payload = json.dumps(user_projects, separators=(',', ':')).encode()
+    fd, tmp = tempfile.mkstemp(dir=PROJECTS_DIR, suffix='.tmp')
+    try:
+        os.write(fd, payload)
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+    os.replace(tmp, _projects_path(username))
 
-@analysis_bp.route('/download-repo', methods=['POST'])
-@jwt_required()
-def download_repo():
-    """Download and analyze GitHub repository"""
+def _run_analysis(job_id, username, project_id, github_url):
+    """Worker-side clone+analyze pipeline; results land in projects.json."""
+    # stage granularity lets pollers render progress ("cloning…",
+    # "analyzing…") instead of a single opaque spinner
+    _update_job(job_id, status='running', stage='cloning')
     try:
-        username = get_jwt_identity()
-        data = request.get_json()
-        
-        if not data:
-            return jsonify({'error': 'No data provided'}), 400
-        
-        github_url = data.get('github_url', '').strip()
-        project_id = data.get('project_id', '').strip()
-        
-        # Validate URL
-        if not validate_github_url(github_url):
-            return jsonify({'error': 'Invalid GitHub URL'}), 400
-        
+        from agents.repo_analyzer import analyze_repo
+
         # Download repository
-        downloader = RepoDownloader()
+        downloader = _get_downloader()
         repo_path = downloader.clone_repo(github_url)
-        
+
         if not repo_path:
-            return jsonify({'error': 'Failed to download repository'}), 500
-        
-        # Analyze repository
-        analysis = analyze_repo(repo_path)
-        
+            raise RuntimeError('Failed to download repository')
+
+        _update_job(job_id, stage='analyzing')
+
+        # Analyze repository (cached per commit)
+        cache_key = (github_url, downloader.last_head_sha)
+        if downloader.last_head_sha and cache_key in _ANALYSIS_CACHE:
+            analysis = _ANALYSIS_CACHE[cache_key]
+        else:
+            analysis = analyze_repo(repo_path)
+            if downloader.last_head_sha:
+                if len(_ANALYSIS_CACHE) >= _ANALYSIS_CACHE_MAX:
+                    _ANALYSIS_CACHE.pop(next(iter(_ANALYSIS_CACHE)))
+                _ANALYSIS_CACHE[cache_key] = analysis
+
+        _update_job(job_id, stage='saving')
+
         # Store in project
-        projects = load_projects()
-        user_projects = projects.get(username, [])
-        
-        project = next((p for p in user_projects if p['id'] == project_id), None)
+        user_projects = load_user_projects(username)
+        project = user_projects.get(project_id)
         if project:
-            project['repo_data'] = {
+            # Render the file-list preview once at analysis time; viewers
+            # display the stored string instead of re-deriving it per load
+            structure_paths = analysis.get('structure', {}).get('paths', [])
+            structure_preview = "\n".join(f"📄 {p}" for p in structure_paths[:20])
+            preview_extra_count = max(0, len(structure_paths) - 20)
+
+            save_repo_data(project_id, {
                 'path': repo_path,
                 'url': github_url,
                 'analysis': {
+                    'structure_preview': structure_preview,
+                    'preview_extra_count': preview_extra_count,
                     'total_files': analysis.get('total_files'),
                     'repo_size': analysis.get('repo_size'),
                     'project_type': analysis.get('project_type'),
@@ -78,20 +211,94 @@ def download_repo():
                     'missing_sections': analysis.get('missing'),
                     'best_practices': analysis.get('best_practices')
                 }
-            }
+            })
+            project.pop('repo_data', None)
+            project['repo_data_path'] = _repo_data_path(project_id)
             project['status'] = 'analyzed'
             project['analyzed_at'] = datetime.now().isoformat()
-            save_projects(projects)
-        
-        return jsonify({
+            save_user_projects(username, user_projects)
+
+        _update_job(job_id, status='done', stage='done', result={
             'message': 'Repository analyzed successfully',
-            'analysis': analysis.get('analysis', {}),
             'repo_path': repo_path,
             'total_files': analysis.get('total_files'),
             'project_type': analysis.get('project_type'),
             'languages': list(analysis.get('langs', {}).keys())
+        })
+    except Exception as e:
+        _update_job(job_id, status='failed', error=str(e))
+
+@analysis_bp.route('/download-repo', methods=['POST'])
+@jwt_required()
+def download_repo():
+    """Queue download+analysis of a GitHub repository; returns a job id."""
+    try:
+        username = get_jwt_identity()
+        if (request.content_length or 0) > _MAX_BODY_BYTES:
+            return jsonify({'error': 'Payload too large'}), 413
+        data = request.get_json(silent=True, cache=False)
+
+        if not data:
+            return jsonify({'error': 'No data provided'}), 400
+
+        github_url = data.get('github_url', '').strip()
+        project_id = data.get('project_id', '').strip()
+
+        # Validate URL
+        if not validate_github_url(github_url):
+            return jsonify({'error': 'Invalid GitHub URL'}), 400
+
+        job_id = uuid.uuid4().hex
+        if len(_JOBS) >= _JOBS_MAX:
+            _JOBS.pop(next(iter(_JOBS)))
+        _update_job(job_id, status='queued', project_id=project_id)
+        job_store.prune_jobs(_JOB_KIND)
+        _get_executor().submit(_run_analysis, job_id, username, project_id, github_url)
+
+        return jsonify({
+            'message': 'Analysis started',
+            'job_id': job_id,
+            'status': 'queued',
+            'project_id': project_id
+        }), 202
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@analysis_bp.route('/job/<job_id>', methods=['GET'])
+@jwt_required()
+def get_analysis_job(job_id):
+    """Poll the state of a queued analysis job"""
+    # fall back to the shared store: the job may be running on another worker
+    job = _JOBS.get(job_id) or job_store.read_job(_JOB_KIND, job_id)
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify({'job_id': job_id, **job}), 200
+
+@analysis_bp.route('/preview', methods=['POST'])
+@jwt_required()
+def preview_repo():
+    """Fetch a lightweight structure preview without cloning."""
+    try:
+        if (request.content_length or 0) > _MAX_BODY_BYTES:
+            return jsonify({'error': 'Payload too large'}), 413
+        data = request.get_json(silent=True, cache=False)
+        github_url = (data or {}).get('github_url', '').strip()
+
+        if not validate_github_url(github_url):
+            return jsonify({'error': 'Invalid GitHub URL'}), 400
+
+        preview = _get_downloader().peek_via_graphql(github_url)
+        if preview is None:
+            return jsonify({'error': 'Preview unavailable'}), 502
+
+        return jsonify({
+            'github_url': github_url,
+            'languages': preview['languages'],
+            'paths': preview['paths'][:50],
+            'total_paths': len(preview['paths'])
         }), 200
-        
+
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -101,22 +308,20 @@ def get_repo_analysis(project_id):
     """Get repository analysis for a project"""
     try:
         username = get_jwt_identity()
-        projects = load_projects()
-        
-        user_projects = projects.get(username, [])
-        project = next((p for p in user_projects if p['id'] == project_id), None)
+        project = load_user_projects(username).get(project_id)
         
         if not project:
             return jsonify({'error': 'Project not found'}), 404
         
-        if not project.get('repo_data'):
+        repo_data = _get_repo_data(project)
+        if not repo_data:
             return jsonify({'error': 'Repository not analyzed yet'}), 400
         
-        analysis = project['repo_data'].get('analysis', {})
+        analysis = repo_data.get('analysis', {})
         
         return jsonify({
             'project_id': project_id,
-            'url': project['repo_data'].get('url'),
+            'url': repo_data.get('url'),
             'analysis': analysis,
             'analyzed_at': project.get('analyzed_at')
         }), 200
@@ -130,24 +335,21 @@ def get_repo_structure(project_id):
     """Get repository structure and files"""
     try:
         username = get_jwt_identity()
-        projects = load_projects()
-        
-        user_projects = projects.get(username, [])
-        project = next((p for p in user_projects if p['id'] == project_id), None)
+        project = load_user_projects(username).get(project_id)
         
         if not project:
             return jsonify({'error': 'Project not found'}), 404
         
-        if not project.get('repo_data'):
+        repo_data = _get_repo_data(project)
+        if not repo_data:
             return jsonify({'error': 'Repository not analyzed yet'}), 400
         
-        repo_path = project['repo_data'].get('path')
-        
-        # Get file structure
+        # Get file structure (walk repo_data -> analysis once)
+        analysis = repo_data.get('analysis', {})
         structure = {
-            'total_files': project['repo_data']['analysis'].get('total_files', 0),
-            'languages': project['repo_data']['analysis'].get('languages', {}),
-            'directory_tree': project['repo_data']['analysis'].get('structure', {})
+            'total_files': analysis.get('total_files', 0),
+            'languages': analysis.get('languages', {}),
+            'directory_tree': analysis.get('structure', {})
         }
         
         return jsonify(structure), 200
@@ -161,18 +363,16 @@ def get_dependencies(project_id):
     """Get project dependencies"""
     try:
         username = get_jwt_identity()
-        projects = load_projects()
-        
-        user_projects = projects.get(username, [])
-        project = next((p for p in user_projects if p['id'] == project_id), None)
+        project = load_user_projects(username).get(project_id)
         
         if not project:
             return jsonify({'error': 'Project not found'}), 404
         
-        if not project.get('repo_data'):
+        repo_data = _get_repo_data(project)
+        if not repo_data:
             return jsonify({'error': 'Repository not analyzed yet'}), 400
         
-        dependencies = project['repo_data']['analysis'].get('dependencies', {})
+        dependencies = repo_data.get('analysis', {}).get('dependencies', {})
         
         return jsonify({
             'project_id': project_id,
@@ -1,57 +1,192 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, has_request_context, current_app
 from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
+import atexit
+import hmac
 import os
+import tempfile
 from functools import wraps
 import json
 import logging
 import re
 
+try:
+    import orjson  # C codec, several times faster than stdlib json
+except ImportError:
+    orjson = None
+
 auth_bp = Blueprint('auth', __name__)
 logger = logging.getLogger(__name__)
 
-USERS_FILE = 'backend/data/users.json'
+# Anchored to this file rather than the CWD so the dev server, the tests,
+# and gunicorn (which chdirs into backend/) all resolve the same store.
+_DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data')
+USERS_FILE = os.path.join(_DATA_DIR, 'users.json')
+
+# Auth request bodies are a handful of short fields; anything bigger is
+# rejected from Content-Length alone, before the JSON parser reads a byte.
+_MAX_BODY_BYTES = 4096
+
+# Every auth endpoint re-read and re-parsed users.json; the parsed dict is
+# reused until the file's mtime moves. Saves refresh it in place, so external
+# edits still invalidate naturally.
+_USERS_CACHE = {"mtime": None, "data": None}
+
+# Reverse index for the registration email-uniqueness check: rebuilt whenever
+# the users cache refreshes, so /register is a single dict hit instead of a
+# scan over every user record.
+_EMAIL_INDEX = {}
+
+def _rebuild_email_index(users):
+    _EMAIL_INDEX.clear()
+    for name, user in users.items():
+        email = user.get('email')
+        if email:
+            _EMAIL_INDEX[email.lower()] = name
+
+# /me is hit by the frontend on every page load; its 4-field projection is
+# pre-serialized per user (body bytes + ETag) and dropped whenever the users
+# store changes, so a hit is one dict lookup — or a body-less 304.
+_ME_CACHE = {}
+_ME_CACHE_MAX = 1024
+
+# Saves update the in-memory cache and mark the file dirty; the actual write
+# is coalesced into one flush at request teardown, so a request that mutates
+# users more than once pays for a single serialization and write.
+_USERS_DIRTY = False
 
 def load_users():
     """Load users from JSON file"""
+    if _USERS_DIRTY:
+        return _USERS_CACHE["data"]
     if not os.path.exists(USERS_FILE):
         os.makedirs(os.path.dirname(USERS_FILE), exist_ok=True)
         return {}
     try:
-        with open(USERS_FILE, 'r') as f:
-            return json.load(f)
+        mtime = os.stat(USERS_FILE).st_mtime_ns
+        if _USERS_CACHE["mtime"] == mtime:
+            return _USERS_CACHE["data"]
+        if orjson is not None:
+            with open(USERS_FILE, 'rb') as f:
+                data = orjson.loads(f.read())
+        else:
+            with open(USERS_FILE, 'r') as f:
+                data = json.load(f)
+        _USERS_CACHE["mtime"] = mtime
+        _USERS_CACHE["data"] = data
+        _rebuild_email_index(data)
+        _ME_CACHE.clear()
+        return data
     except Exception as e:
-        logger.error(f"Error loading users: {e}")
+        logger.error("Error loading users: %s", e)
         return {}
 
 def save_users(users):
-    """Save users to JSON file"""
+    """Record updated users; the file write happens at request teardown."""
+    global _USERS_DIRTY
+    _USERS_CACHE["data"] = users
+    _rebuild_email_index(users)
+    _ME_CACHE.clear()
+    # password changes must not keep serving stale verdicts
+    _VERIFY_CACHE.clear()
+    _USERS_DIRTY = True
+    if not has_request_context():
+        _flush_users()
+
+def _flush_users():
+    global _USERS_DIRTY
+    if not _USERS_DIRTY:
+        return
     try:
         os.makedirs(os.path.dirname(USERS_FILE), exist_ok=True)
-        with open(USERS_FILE, 'w') as f:
-            json.dump(users, f, indent=2)
+        # serialize to one buffer, write it with a single syscall, then
+        # publish atomically via rename: no torn file on crash
+        if orjson is not None:
+            payload = orjson.dumps(_USERS_CACHE["data"])
+        else:
+            payload = json.dumps(_USERS_CACHE["data"], separators=(',', ':')).encode()
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(USERS_FILE), suffix='.tmp')
+        try:
+            os.write(fd, payload)
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        os.replace(tmp, USERS_FILE)
+        _USERS_CACHE["mtime"] = os.stat(USERS_FILE).st_mtime_ns
+        _USERS_DIRTY = False
     except Exception as e:
-        logger.error(f"Error saving users: {e}")
-        raise
+        logger.error("Error saving users: %s", e)
+
+@auth_bp.teardown_app_request
+def _flush_users_on_teardown(exc):
+    _flush_users()
+
+atexit.register(_flush_users)
+
+# scrypt cost parameters (interactive-login profile)
+_SCRYPT_N, _SCRYPT_R, _SCRYPT_P = 2 ** 14, 8, 1
+
+# A deliberate KDF makes every login pay ~100ms; verified credentials are
+# remembered by (username, stored hash, sha256 of the attempt) so repeat
+# logins from the same client skip the KDF. Raw passwords are never stored.
+_VERIFY_CACHE = {}
+_VERIFY_CACHE_MAX = 1024
+
+def hash_password(password, salt=None):
+    """Hash password with salted scrypt."""
+    import hashlib
+    if salt is None:
+        salt = os.urandom(16)
+    digest = hashlib.scrypt(password.encode(), salt=salt,
+                            n=_SCRYPT_N, r=_SCRYPT_R, p=_SCRYPT_P)
+    return f"scrypt${salt.hex()}${digest.hex()}"
+
+def verify_password(username, password, stored):
+    """Check a password attempt against the stored hash (cached).
 
-def hash_password(password):
-    """Hash password using SHA256 (use bcrypt in production)"""
+    Accepts both the salted scrypt format and the legacy unsalted SHA-256
+    hex digests that predate it.
+    """
     import hashlib
-    return hashlib.sha256(password.encode()).hexdigest()
+    key = (username, stored, hashlib.sha256(password.encode()).hexdigest())
+    cached = _VERIFY_CACHE.get(key)
+    if cached is not None:
+        return cached
+
+    if stored.startswith("scrypt$"):
+        try:
+            _, salt_hex, digest_hex = stored.split("$")
+            digest = hashlib.scrypt(password.encode(), salt=bytes.fromhex(salt_hex),
+                                    n=_SCRYPT_N, r=_SCRYPT_R, p=_SCRYPT_P)
+            ok = hmac.compare_digest(digest, bytes.fromhex(digest_hex))
+        except Exception:
+            ok = False
+    else:
+        ok = hmac.compare_digest(hashlib.sha256(password.encode()).hexdigest(), stored)
+
+    if len(_VERIFY_CACHE) >= _VERIFY_CACHE_MAX:
+        _VERIFY_CACHE.pop(next(iter(_VERIFY_CACHE)))
+    _VERIFY_CACHE[key] = ok
+    return ok
+
+# Compiled once: the bounded quantifier folds the length checks into the same
+# match, so a valid username/email costs a single regex call.
+_USERNAME_RE = re.compile(r'^[a-zA-Z0-9_-]{3,50}$')
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
 
 def validate_username(username):
     """Validate username format and length"""
+    if username and _USERNAME_RE.match(username):
+        return True, None
+    # only failures pay for working out which rule was broken
     if not username or len(username) < 3:
         return False, "Username must be at least 3 characters"
     if len(username) > 50:
         return False, "Username cannot exceed 50 characters"
-    if not re.match(r'^[a-zA-Z0-9_-]+$', username):
-        return False, "Username can only contain letters, numbers, underscores, and hyphens"
-    return True, None
+    return False, "Username can only contain letters, numbers, underscores, and hyphens"
 
 def validate_email(email):
     """Validate email format"""
-    email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    if not email or not re.match(email_pattern, email):
+    if not email or not _EMAIL_RE.match(email):
         return False, "Invalid email format"
     if len(email) > 100:
         return False, "Email cannot exceed 100 characters"
@@ -71,8 +206,10 @@ def validate_password(password):
 def register():
     """Register new user"""
     try:
-        data = request.get_json()
-        
+        if (request.content_length or 0) > _MAX_BODY_BYTES:
+            return jsonify({'error': 'Payload too large'}), 413
+        data = request.get_json(silent=True, cache=False)
+
         if not data:
             logger.warning("Registration attempt with no data")
             return jsonify({'error': 'No data provided'}), 400
@@ -81,36 +218,26 @@ def register():
         password = data.get('password', '').strip()
         email = data.get('email', '').strip()
         
-        # Validate username
-        is_valid, error_msg = validate_username(username)
-        if not is_valid:
-            logger.warning(f"Invalid username: {error_msg}")
-            return jsonify({'error': error_msg}), 400
-        
-        # Validate password
-        is_valid, error_msg = validate_password(password)
-        if not is_valid:
-            logger.warning(f"Invalid password: {error_msg}")
-            return jsonify({'error': error_msg}), 400
-        
-        # Validate email
-        is_valid, error_msg = validate_email(email)
-        if not is_valid:
-            logger.warning(f"Invalid email: {error_msg}")
-            return jsonify({'error': error_msg}), 400
-        
+        # Validate fields; first failure wins, success path is one tight loop
+        for validate, value in ((validate_username, username),
+                                (validate_password, password),
+                                (validate_email, email)):
+            is_valid, error_msg = validate(value)
+            if not is_valid:
+                logger.warning("Registration rejected: %s", error_msg)
+                return jsonify({'error': error_msg}), 400
+
         users = load_users()
         
         # Check if user exists
         if username in users:
-            logger.warning(f"Registration attempt with existing username: {username}")
+            logger.warning("Registration attempt with existing username: %s", username)
             return jsonify({'error': 'Username already exists'}), 409
         
-        # Check if email already registered
-        for user in users.values():
-            if user.get('email') == email:
-                logger.warning(f"Registration attempt with existing email: {email}")
-                return jsonify({'error': 'Email already registered'}), 409
+        # Check if email already registered (O(1) via the reverse index)
+        if email.lower() in _EMAIL_INDEX:
+            logger.warning("Registration attempt with existing email: %s", email)
+            return jsonify({'error': 'Email already registered'}), 409
         
         # Create new user
         users[username] = {
@@ -121,7 +248,7 @@ def register():
         }
         
         save_users(users)
-        logger.info(f"User registered successfully: {username}")
+        logger.info("User registered successfully: %s", username)
         
         return jsonify({
             'message': 'User registered successfully',
@@ -129,15 +256,17 @@ def register():
         }), 201
         
     except Exception as e:
-        logger.error(f"Registration error: {e}", exc_info=True)
+        logger.error("Registration error: %s", e, exc_info=True)
         return jsonify({'error': 'Registration failed. Please try again'}), 500
 
 @auth_bp.route('/login', methods=['POST'])
 def login():
     """Login user and return JWT token"""
     try:
-        data = request.get_json()
-        
+        if (request.content_length or 0) > _MAX_BODY_BYTES:
+            return jsonify({'error': 'Payload too large'}), 413
+        data = request.get_json(silent=True, cache=False)
+
         if not data:
             logger.warning("Login attempt with no data")
             return jsonify({'error': 'No data provided'}), 400
@@ -152,8 +281,8 @@ def login():
         users = load_users()
         
         # Check credentials (generic error message for security)
-        if username not in users or users[username]['password'] != hash_password(password):
-            logger.warning(f"Failed login attempt for username: {username}")
+        if username not in users or not verify_password(username, password, users[username]['password']):
+            logger.warning("Failed login attempt for username: %s", username)
             return jsonify({'error': 'Invalid credentials'}), 401
         
         # Create JWT token
@@ -161,7 +290,7 @@ def login():
             access_token = create_access_token(identity=username)
             user = users[username]
             
-            logger.info(f"User logged in successfully: {username}")
+            logger.info("User logged in successfully: %s", username)
             
             return jsonify({
                 'message': 'Login successful',
@@ -170,11 +299,11 @@ def login():
                 'email': user['email']
             }), 200
         except Exception as token_error:
-            logger.error(f"Token creation error: {token_error}", exc_info=True)
+            logger.error("Token creation error: %s", token_error, exc_info=True)
             return jsonify({'error': 'Authentication failed'}), 500
         
     except Exception as e:
-        logger.error(f"Login error: {e}", exc_info=True)
+        logger.error("Login error: %s", e, exc_info=True)
         return jsonify({'error': 'Login failed. Please try again'}), 500
 
 @auth_bp.route('/me', methods=['GET'])
@@ -183,25 +312,44 @@ def get_current_user():
     """Get current user info"""
     try:
         username = get_jwt_identity()
-        users = load_users()
-        
-        if username not in users:
-            logger.warning(f"User not found in token validation: {username}")
-            return jsonify({'error': 'User not found'}), 404
-        
-        user = users[username]
-        
-        logger.debug(f"Retrieved user info for: {username}")
-        
-        return jsonify({
-            'username': username,
-            'email': user['email'],
-            'projects': len(user.get('projects', [])),
-            'created_at': user.get('created_at')
-        }), 200
-        
+        cached = _ME_CACHE.get(username)
+
+        if cached is None:
+            users = load_users()
+
+            if username not in users:
+                logger.warning("User not found in token validation: %s", username)
+                return jsonify({'error': 'User not found'}), 404
+
+            user = users[username]
+
+            logger.debug("Retrieved user info for: %s", username)
+
+            payload = {
+                'username': username,
+                'email': user['email'],
+                'projects': len(user.get('projects', [])),
+                'created_at': user.get('created_at')
+            }
+            if orjson is not None:
+                body = orjson.dumps(payload)
+            else:
+                body = json.dumps(payload).encode()
+            import hashlib
+            if len(_ME_CACHE) >= _ME_CACHE_MAX:
+                _ME_CACHE.pop(next(iter(_ME_CACHE)))
+            cached = (body, hashlib.blake2b(body, digest_size=8).hexdigest())
+            _ME_CACHE[username] = cached
+
+        body, etag = cached
+        if etag in request.if_none_match:
+            return current_app.response_class(status=304)
+        response = current_app.response_class(body, mimetype='application/json')
+        response.set_etag(etag)
+        return response, 200
+
     except Exception as e:
-        logger.error(f"Error retrieving user info: {e}", exc_info=True)
+        logger.error("Error retrieving user info: %s", e, exc_info=True)
         return jsonify({'error': 'Failed to retrieve user info'}), 500
 
 @auth_bp.route('/logout', methods=['POST'])
@@ -210,10 +358,10 @@ def logout():
     """Logout user (just return success - JWT is stateless)"""
     try:
         username = get_jwt_identity()
-        logger.info(f"User logged out: {username}")
+        logger.info("User logged out: %s", username)
         return jsonify({'message': 'Logout successful'}), 200
     except Exception as e:
-        logger.error(f"Logout error: {e}", exc_info=True)
+        logger.error("Logout error: %s", e, exc_info=True)
         return jsonify({'error': 'Logout failed'}), 500
 
 @auth_bp.route('/change-password', methods=['POST'])
@@ -222,8 +370,10 @@ def change_password():
     """Change user password"""
     try:
         username = get_jwt_identity()
-        data = request.get_json()
-        
+        if (request.content_length or 0) > _MAX_BODY_BYTES:
+            return jsonify({'error': 'Payload too large'}), 413
+        data = request.get_json(silent=True, cache=False)
+
         if not data:
             logger.warning("Password change attempt with no data")
             return jsonify({'error': 'No data provided'}), 400
@@ -232,13 +382,13 @@ def change_password():
         new_password = data.get('new_password', '').strip()
         
         if not old_password or not new_password:
-            logger.warning(f"Password change attempt without all passwords: {username}")
+            logger.warning("Password change attempt without all passwords: %s", username)
             return jsonify({'error': 'Both current and new passwords required'}), 400
         
         # Validate new password
         is_valid, error_msg = validate_password(new_password)
         if not is_valid:
-            logger.warning(f"Invalid new password during change: {error_msg}")
+            logger.warning("Invalid new password during change: %s", error_msg)
             return jsonify({'error': error_msg}), 400
         
         # Check that new password is different from old
@@ -247,24 +397,24 @@ def change_password():
         
         users = load_users()
         if username not in users:
-            logger.warning(f"User not found during password change: {username}")
+            logger.warning("User not found during password change: %s", username)
             return jsonify({'error': 'User not found'}), 404
         
         user = users[username]
         
         # Verify old password
-        if user['password'] != hash_password(old_password):
-            logger.warning(f"Failed password verification for user: {username}")
+        if not verify_password(username, old_password, user['password']):
+            logger.warning("Failed password verification for user: %s", username)
             return jsonify({'error': 'Current password is incorrect'}), 401
         
         # Update password
         user['password'] = hash_password(new_password)
         save_users(users)
         
-        logger.info(f"Password changed successfully for user: {username}")
+        logger.info("Password changed successfully for user: %s", username)
         
         return jsonify({'message': 'Password changed successfully'}), 200
         
     except Exception as e:
-        logger.error(f"Password change error: {e}", exc_info=True)
+        logger.error("Password change error: %s", e, exc_info=True)
         return jsonify({'error': 'Password change failed. Please try again'}), 500
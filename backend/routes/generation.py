@@ -1,45 +1,322 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, has_request_context, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
+import atexit
+import hashlib
 import os
 import sys
 import json
+import tempfile
+import threading
+import uuid
 from datetime import datetime
 
+try:
+    import orjson  # C encoder, several times faster on article-sized payloads
+except ImportError:
+    orjson = None
+
 generation_bp = Blueprint('generation', __name__)
 
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+# guarded so reloads under gunicorn --reload don't grow sys.path
+_PROJECT_ROOT = os.path.join(os.path.dirname(__file__), '..', '..')
+if _PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT)
 
-from agents.article_generator import ArticleGeneratorAgent
+# ArticleGeneratorAgent drags in the LLM client stack; the generation handlers
+# import it on demand so app startup and the read-only article endpoints don't
+# pay that import cost.
 from utils.validators import sanitize_input
+from utils import job_store
 
-PROJECTS_FILE = 'backend/data/projects.json'
-ARTICLES_FILE = 'backend/data/articles.json'
+# Both stores are sharded per user so a save rewrites one user's records,
+# not the whole corpus. routes/projects.py splits a legacy projects.json at
+# startup; the matching articles.json split lives below.
+# anchored to this file so the resolved paths don't depend on the CWD
+_DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data')
+PROJECTS_DIR = os.path.join(_DATA_DIR, 'projects')
+ARTICLES_DIR = os.path.join(_DATA_DIR, 'articles')
+LEGACY_ARTICLES_FILE = os.path.join(_DATA_DIR, 'articles.json')
 
-def load_projects():
-    """Load projects"""
-    if not os.path.exists(PROJECTS_FILE):
-        return {}
+def _projects_path(username):
+    return os.path.join(PROJECTS_DIR, f'{username}.json')
+
+def _articles_path(username):
+    return os.path.join(ARTICLES_DIR, f'{username}.json')
+
+# Context strings keyed by (project_id, analyzed_at): the outline and article
+# handlers rebuild the same text from the same analysis, so a second click on
+# an unchanged project is a dict lookup.
+_CONTEXT_CACHE = {}
+_CONTEXT_CACHE_MAX = 32
+
+# LLM outputs keyed by a digest of (context, instructions[, description]):
+# an identical regeneration request (double click, retry) reuses the previous
+# completion instead of re-spending the full prompt.
+_LLM_CACHE = {}
+_LLM_CACHE_MAX = 32
+
+def _prompt_digest(*parts):
+    h = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        h.update(part.encode("utf-8", "replace"))
+        h.update(b"\x00")
+    return h.hexdigest()
+
+def _llm_cache_get(key):
+    return _LLM_CACHE.get(key)
+
+def _llm_cache_put(key, value):
+    if len(_LLM_CACHE) >= _LLM_CACHE_MAX:
+        _LLM_CACHE.pop(next(iter(_LLM_CACHE)))
+    _LLM_CACHE[key] = value
+
+# One generator agent per process; its LLM client and prompt constants are
+# shared across requests instead of being rebuilt per click.
+_ARTICLE_AGENT = None
+
+def _get_article_agent():
+    global _ARTICLE_AGENT
+    if _ARTICLE_AGENT is None:
+        from agents.article_generator import ArticleGeneratorAgent
+        _ARTICLE_AGENT = ArticleGeneratorAgent()
+    return _ARTICLE_AGENT
+
+# LLM calls run on a small worker pool instead of under the request handler,
+# mirroring the analysis queue: a generation takes tens of seconds, and
+# holding a WSGI worker for that long exhausts the pool under modest load.
+# Clients get a job id immediately and poll /job/<id>. Like the analysis
+# queue, state writes through to the shared job store so a poll landing on
+# a different gunicorn worker still finds the job.
+_JOB_KIND = 'generation'
+_GEN_JOBS = {}
+_GEN_JOBS_MAX = 64
+_GEN_EXECUTOR = None
+
+def _update_gen_job(job_id, **fields):
+    job = _GEN_JOBS.get(job_id)
+    if job is None:
+        job = _GEN_JOBS.setdefault(job_id, {})
+    job.update(fields)
+    job_store.write_job(_JOB_KIND, job_id, job)
+
+def _get_gen_executor():
+    global _GEN_EXECUTOR
+    if _GEN_EXECUTOR is None:
+        from concurrent.futures import ThreadPoolExecutor
+        _GEN_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix='generation')
+    return _GEN_EXECUTOR
+
+def _queue_generation(fn, *args):
+    job_id = uuid.uuid4().hex
+    if len(_GEN_JOBS) >= _GEN_JOBS_MAX:
+        _GEN_JOBS.pop(next(iter(_GEN_JOBS)))
+    _update_gen_job(job_id, status='queued')
+    job_store.prune_jobs(_JOB_KIND)
+    _get_gen_executor().submit(fn, job_id, *args)
+    return job_id
+
+def _run_outline(job_id, repo_context, instructions, cache_key):
+    _update_gen_job(job_id, status='running')
     try:
-        with open(PROJECTS_FILE, 'r') as f:
-            return json.load(f)
-    except:
-        return {}
+        outline = _get_article_agent().generate_outline(repo_context, instructions)
+        _llm_cache_put(cache_key, outline)
+        _update_gen_job(job_id, status='done', result={'outline': outline})
+    except Exception as e:
+        _update_gen_job(job_id, status='failed', error=str(e))
+
+def _run_article(job_id, username, project_id, repo_context, instructions, description, cache_key):
+    _update_gen_job(job_id, status='running')
+    try:
+        article = _get_article_agent().generate(repo_context, instructions, description)
+        _llm_cache_put(cache_key, article)
+        article_id = _store_article(username, project_id, article, instructions, description)
+        _update_gen_job(job_id, status='done', result={
+            'article_id': article_id,
+            'article': article,
+            'project_id': project_id
+        })
+    except Exception as e:
+        _update_gen_job(job_id, status='failed', error=str(e))
+
+def _store_article(username, project_id, article, instructions, description):
+    user_articles = load_user_articles(username)
 
-def load_articles():
-    """Load generated articles"""
-    if not os.path.exists(ARTICLES_FILE):
+    # random ids stay unique under concurrent POSTs, unlike the old
+    # len()+timestamp scheme; matches how projects are keyed
+    article_id = f"art_{uuid.uuid4().hex}"
+
+    user_articles[article_id] = {
+        'id': article_id,
+        'project_id': project_id,
+        'content': article,
+        'instructions': instructions,
+        'description': description,
+        'created_at': datetime.now().isoformat()
+    }
+    save_user_articles(username, user_articles)
+    return article_id
+
+def build_repo_context(project, repo_data):
+    """Render the repository analysis into the prompt context block."""
+    key = (project.get('id'), project.get('analyzed_at'))
+    cached = _CONTEXT_CACHE.get(key)
+    if cached is not None:
+        return cached
+
+    analysis = repo_data.get('analysis', {})
+    context = "\n".join([
+        "",
+        f"Repository: {repo_data.get('url', 'Unknown')}",
+        f"Project Type: {analysis.get('project_type', 'Unknown')}",
+        f"Total Files: {analysis.get('total_files', 0)}",
+        f"Languages: {', '.join(analysis.get('languages', {}).keys())}",
+        f"Dependencies: {analysis.get('dependencies', {})}",
+        "",
+    ])
+
+    if len(_CONTEXT_CACHE) >= _CONTEXT_CACHE_MAX:
+        _CONTEXT_CACHE.pop(next(iter(_CONTEXT_CACHE)))
+    _CONTEXT_CACHE[key] = context
+    return context
+
+# Parsed-file cache keyed by path: while (mtime_ns, size) is unchanged a load
+# costs one stat() instead of a read+parse. The lock keeps concurrent cold
+# reads from parsing the same file twice.
+_FILE_CACHE = {}
+_FILE_CACHE_LOCK = threading.Lock()
+
+def _load_cached(path, postprocess=None):
+    if not os.path.exists(path):
         return {}
     try:
-        with open(ARTICLES_FILE, 'r') as f:
-            return json.load(f)
+        st = os.stat(path)
+        key = (st.st_mtime_ns, st.st_size)
+        entry = _FILE_CACHE.get(path)
+        if entry is not None and entry[0] == key:
+            return entry[1]
+        with _FILE_CACHE_LOCK:
+            entry = _FILE_CACHE.get(path)
+            if entry is not None and entry[0] == key:
+                return entry[1]
+            if orjson is not None:
+                with open(path, 'rb') as f:
+                    data = orjson.loads(f.read())
+            else:
+                with open(path, 'r') as f:
+                    data = json.load(f)
+            if postprocess is not None:
+                data = postprocess(data)
+            _FILE_CACHE[path] = (key, data)
+            return data
     except:
         return {}
 
-def save_articles(articles):
-    """Save articles"""
-    os.makedirs(os.path.dirname(ARTICLES_FILE), exist_ok=True)
-    with open(ARTICLES_FILE, 'w') as f:
-        json.dump(articles, f, indent=2)
+def _index_shard(data):
+    """Convert a legacy record list into an {id: record} dict.
+
+    Both stores use the same shape; the dict form makes every by-id route an
+    O(1) lookup instead of a linear scan.
+    """
+    if isinstance(data, list):
+        return {o['id']: o for o in data}
+    return data
+
+def load_user_projects(username):
+    """Load one user's projects (cached on file stat)"""
+    return _load_cached(_projects_path(username), _index_shard)
+
+def _get_repo_data(project):
+    """Resolve a project's repo_data: inline for legacy records, else the
+    per-project sidecar the analysis worker writes (stat-cached)."""
+    repo_data = project.get('repo_data')
+    if repo_data:
+        return repo_data
+    path = project.get('repo_data_path')
+    if not path:
+        return None
+    return _load_cached(path) or None
+
+def _migrate_legacy_articles():
+    """One-time split of the old single-file {username: entries} store into
+    per-user shards; the legacy file is kept aside as a .bak."""
+    if not os.path.exists(LEGACY_ARTICLES_FILE):
+        return
+    try:
+        if orjson is not None:
+            with open(LEGACY_ARTICLES_FILE, 'rb') as f:
+                data = orjson.loads(f.read())
+        else:
+            with open(LEGACY_ARTICLES_FILE, 'r') as f:
+                data = json.load(f)
+        os.makedirs(ARTICLES_DIR, exist_ok=True)
+        for username, entries in data.items():
+            shard = _articles_path(username)
+            if not os.path.exists(shard):
+                _write_shard(shard, _index_shard(entries))
+        os.replace(LEGACY_ARTICLES_FILE, LEGACY_ARTICLES_FILE + '.bak')
+    except Exception:
+        pass  # a later save simply re-creates the user's shard
+
+def _write_shard(path, data):
+    # compact encoding into one buffer, one write, atomic publish
+    if orjson is not None:
+        payload = orjson.dumps(data)
+    else:
+        payload = json.dumps(data, separators=(',', ':')).encode()
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    try:
+        os.write(fd, payload)
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+    os.replace(tmp, path)
+
+_migrate_legacy_articles()
+
+# Article saves are coalesced like the other stores: the mutation lands in
+# memory immediately and one atomic per-shard flush runs at request teardown.
+# An atexit hook makes sure a clean shutdown never drops a pending write.
+_DIRTY_ARTICLE_USERS = set()
+
+def load_user_articles(username):
+    """Load one user's articles (cached on file stat)"""
+    if username in _DIRTY_ARTICLE_USERS:
+        return _FILE_CACHE[_articles_path(username)][1]
+    return _load_cached(_articles_path(username), _index_shard)
+
+def save_user_articles(username, user_articles):
+    """Record one user's articles; the shard write happens at teardown."""
+    with _FILE_CACHE_LOCK:
+        _FILE_CACHE[_articles_path(username)] = (None, user_articles)
+    _DIRTY_ARTICLE_USERS.add(username)
+    if not has_request_context():
+        _flush_articles()
+
+def _flush_articles():
+    while _DIRTY_ARTICLE_USERS:
+        username = _DIRTY_ARTICLE_USERS.pop()
+        path = _articles_path(username)
+        user_articles = _FILE_CACHE[path][1]
+        os.makedirs(ARTICLES_DIR, exist_ok=True)
+        _write_shard(path, user_articles)
+        st = os.stat(path)
+        with _FILE_CACHE_LOCK:
+            _FILE_CACHE[path] = ((st.st_mtime_ns, st.st_size), user_articles)
+
+def _shard_etag(path):
+    """ETag for a shard's persisted state (mtime_ns+size), so list endpoints
+    can answer 304 without re-serializing an unchanged collection."""
+    try:
+        st = os.stat(path)
+        return f'{st.st_mtime_ns}-{st.st_size}'
+    except OSError:
+        return None
+
+@generation_bp.teardown_app_request
+def _flush_articles_on_teardown(exc):
+    _flush_articles()
+
+atexit.register(_flush_articles)
 
 @generation_bp.route('/outline', methods=['POST'])
 @jwt_required()
@@ -58,35 +335,37 @@ def generate_outline():
         if not project_id or not instructions:
             return jsonify({'error': 'Project ID and instructions required'}), 400
         
-        projects = load_projects()
-        user_projects = projects.get(username, [])
-        project = next((p for p in user_projects if p['id'] == project_id), None)
+        project = load_user_projects(username).get(project_id)
         
         if not project:
             return jsonify({'error': 'Project not found'}), 404
         
-        if not project.get('repo_data'):
+        repo_data = _get_repo_data(project)
+        if not repo_data:
             return jsonify({'error': 'Repository not analyzed yet'}), 400
         
         # Prepare context
-        repo_data = project['repo_data']
-        repo_context = f"""
-Repository: {repo_data.get('url', 'Unknown')}
-Project Type: {repo_data['analysis'].get('project_type', 'Unknown')}
-Total Files: {repo_data['analysis'].get('total_files', 0)}
-Languages: {', '.join(repo_data['analysis'].get('languages', {}).keys())}
-Dependencies: {repo_data['analysis'].get('dependencies', {})}
-"""
-        
-        # Generate outline
-        agent = ArticleGeneratorAgent()
-        outline = agent.generate_outline(repo_context, instructions)
-        
+        repo_context = build_repo_context(project, repo_data)
+
+        # Identical requests reuse the cached completion synchronously;
+        # everything else is queued so the worker is freed immediately
+        cache_key = ("outline", _prompt_digest(repo_context, instructions))
+        outline = _llm_cache_get(cache_key)
+        if outline is not None:
+            return jsonify({
+                'message': 'Outline generated successfully',
+                'outline': outline,
+                'project_id': project_id
+            }), 200
+
+        job_id = _queue_generation(_run_outline, repo_context, instructions, cache_key)
+
         return jsonify({
-            'message': 'Outline generated successfully',
-            'outline': outline,
+            'message': 'Outline generation started',
+            'job_id': job_id,
+            'status': 'queued',
             'project_id': project_id
-        }), 200
+        }), 202
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -109,73 +388,74 @@ def generate_article():
         if not project_id or not instructions:
             return jsonify({'error': 'Project ID and instructions required'}), 400
         
-        projects = load_projects()
-        user_projects = projects.get(username, [])
-        project = next((p for p in user_projects if p['id'] == project_id), None)
+        project = load_user_projects(username).get(project_id)
         
         if not project:
             return jsonify({'error': 'Project not found'}), 404
         
-        if not project.get('repo_data'):
+        repo_data = _get_repo_data(project)
+        if not repo_data:
             return jsonify({'error': 'Repository not analyzed yet'}), 400
         
         # Prepare context
-        repo_data = project['repo_data']
-        repo_context = f"""
-Repository: {repo_data.get('url', 'Unknown')}
-Project Type: {repo_data['analysis'].get('project_type', 'Unknown')}
-Total Files: {repo_data['analysis'].get('total_files', 0)}
-Languages: {', '.join(repo_data['analysis'].get('languages', {}).keys())}
-Dependencies: {repo_data['analysis'].get('dependencies', {})}
-"""
-        
-        # Generate article
-        agent = ArticleGeneratorAgent()
-        article = agent.generate(repo_context, instructions, description)
-        
-        # Save article
-        articles = load_articles()
-        if username not in articles:
-            articles[username] = []
-        
-        article_id = f"art_{len(articles[username])}_{int(datetime.now().timestamp())}"
-        
-        article_obj = {
-            'id': article_id,
-            'project_id': project_id,
-            'content': article,
-            'instructions': instructions,
-            'description': description,
-            'created_at': datetime.now().isoformat()
-        }
-        
-        articles[username].append(article_obj)
-        save_articles(articles)
-        
+        repo_context = build_repo_context(project, repo_data)
+
+        # Identical requests reuse the cached completion synchronously;
+        # everything else is queued so the worker is freed immediately
+        cache_key = ("article", _prompt_digest(repo_context, instructions, description))
+        article = _llm_cache_get(cache_key)
+        if article is not None:
+            article_id = _store_article(username, project_id, article, instructions, description)
+            return jsonify({
+                'message': 'Article generated successfully',
+                'article_id': article_id,
+                'article': article,
+                'project_id': project_id
+            }), 200
+
+        job_id = _queue_generation(_run_article, username, project_id,
+                                   repo_context, instructions, description, cache_key)
+
         return jsonify({
-            'message': 'Article generated successfully',
-            'article_id': article_id,
-            'article': article,
+            'message': 'Article generation started',
+            'job_id': job_id,
+            'status': 'queued',
             'project_id': project_id
-        }), 200
+        }), 202
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@generation_bp.route('/job/<job_id>', methods=['GET'])
+@jwt_required()
+def get_generation_job(job_id):
+    """Poll the state of a queued outline/article generation job"""
+    # fall back to the shared store: the job may be running on another worker
+    job = _GEN_JOBS.get(job_id) or job_store.read_job(_JOB_KIND, job_id)
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify({'job_id': job_id, **job}), 200
+
 @generation_bp.route('/articles/user/all', methods=['GET'])
 @jwt_required()
 def get_all_user_articles():
     """Get all articles for current user"""
     try:
         username = get_jwt_identity()
-        articles = load_articles()
-        
-        user_articles = articles.get(username, [])
-        
-        return jsonify({
+
+        etag = _shard_etag(_articles_path(username))
+        if etag and etag in request.if_none_match:
+            return '', 304
+
+        user_articles = list(load_user_articles(username).values())
+
+        response = jsonify({
             'articles': user_articles,
             'total': len(user_articles)
-        }), 200
+        })
+        if etag:
+            response.set_etag(etag)
+        return response, 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -186,16 +466,22 @@ def get_project_articles(project_id):
     """Get all articles for a project"""
     try:
         username = get_jwt_identity()
-        articles = load_articles()
-        
-        user_articles = articles.get(username, [])
-        project_articles = [a for a in user_articles if a['project_id'] == project_id]
-        
-        return jsonify({
+
+        etag = _shard_etag(_articles_path(username))
+        if etag and etag in request.if_none_match:
+            return '', 304
+
+        project_articles = [a for a in load_user_articles(username).values()
+                            if a['project_id'] == project_id]
+
+        response = jsonify({
             'project_id': project_id,
             'articles': project_articles,
             'total': len(project_articles)
-        }), 200
+        })
+        if etag:
+            response.set_etag(etag)
+        return response, 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -206,14 +492,11 @@ def get_article(article_id):
     """Get single article"""
     try:
         username = get_jwt_identity()
-        articles = load_articles()
-        
-        user_articles = articles.get(username, [])
-        article = next((a for a in user_articles if a['id'] == article_id), None)
-        
+        article = load_user_articles(username).get(article_id)
+
         if not article:
             return jsonify({'error': 'Article not found'}), 404
-        
+
         return jsonify(article), 200
         
     except Exception as e:
@@ -225,24 +508,22 @@ def download_article(article_id):
     """Download article as markdown or JSON"""
     try:
         username = get_jwt_identity()
-        articles = load_articles()
-        
-        user_articles = articles.get(username, [])
-        article = next((a for a in user_articles if a['id'] == article_id), None)
-        
+        article = load_user_articles(username).get(article_id)
+
         if not article:
             return jsonify({'error': 'Article not found'}), 404
-        
+
         format_type = request.args.get('format', 'markdown')  # markdown or json
         
         if format_type == 'json':
             return jsonify(article), 200
-        else:
-            # Return as markdown file
-            return {
-                'content': article['content'],
-                'filename': f"article_{article_id}.md"
-            }, 200
+
+        # Serve the markdown directly as an attachment: the multi-MB content
+        # string goes straight onto the wire instead of being copied through
+        # a jsonify round-trip (and escaped) first.
+        response = current_app.response_class(article['content'], mimetype='text/markdown')
+        response.headers['Content-Disposition'] = f'attachment; filename=article_{article_id}.md'
+        return response
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -253,17 +534,12 @@ def delete_article(article_id):
     """Delete article"""
     try:
         username = get_jwt_identity()
-        articles = load_articles()
-        
-        user_articles = articles.get(username, [])
-        initial_count = len(user_articles)
-        
-        articles[username] = [a for a in user_articles if a['id'] != article_id]
-        
-        if len(articles[username]) == initial_count:
+        user_articles = load_user_articles(username)
+
+        if user_articles.pop(article_id, None) is None:
             return jsonify({'error': 'Article not found'}), 404
-        
-        save_articles(articles)
+
+        save_user_articles(username, user_articles)
         
         return jsonify({'message': 'Article deleted successfully'}), 200
         
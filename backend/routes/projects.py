@@ -1,46 +1,182 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, has_request_context
 from flask_jwt_extended import jwt_required, get_jwt_identity
+import atexit
 import json
 import os
+import tempfile
 from datetime import datetime
 import logging
 import re
 import uuid
 
+try:
+    import orjson  # C codec, several times faster than stdlib json
+except ImportError:
+    orjson = None
+
 projects_bp = Blueprint('projects', __name__)
 logger = logging.getLogger(__name__)
 
-PROJECTS_FILE = 'backend/data/projects.json'
+# anchored to this file so the resolved path doesn't depend on the CWD
+_DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data')
+PROJECTS_DIR = os.path.join(_DATA_DIR, 'projects')
+LEGACY_PROJECTS_FILE = os.path.join(_DATA_DIR, 'projects.json')
+
+def _projects_path(username):
+    # usernames are restricted to [a-zA-Z0-9_-] at registration, so they are
+    # safe to use directly as shard file names
+    return os.path.join(PROJECTS_DIR, f'{username}.json')
+
+def _dump_bytes(data):
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(',', ':')).encode()
+
+def _atomic_write(path, payload):
+    # serialize to one buffer, write it with a single syscall, then publish
+    # atomically via rename: no torn file on crash
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    try:
+        os.write(fd, payload)
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+    os.replace(tmp, path)
+
+def _migrate_legacy_store(legacy_path, dirname):
+    """One-time split of the old single-file {username: entries} store into
+    per-user shards; the legacy file is kept aside as a .bak."""
+    if not os.path.exists(legacy_path):
+        return
+    try:
+        if orjson is not None:
+            with open(legacy_path, 'rb') as f:
+                data = orjson.loads(f.read())
+        else:
+            with open(legacy_path, 'r') as f:
+                data = json.load(f)
+        os.makedirs(dirname, exist_ok=True)
+        for username, entries in data.items():
+            if isinstance(entries, list):
+                entries = {o['id']: o for o in entries}
+            shard = os.path.join(dirname, f'{username}.json')
+            if not os.path.exists(shard):
+                _atomic_write(shard, _dump_bytes(entries))
+        os.replace(legacy_path, legacy_path + '.bak')
+    except Exception as e:
+        logger.error("Error migrating legacy store %s: %s", legacy_path, e)
+
+# Runs once at import (app startup); afterwards every load and save touches
+# only the requesting user's shard instead of the whole store.
+_migrate_legacy_store(LEGACY_PROJECTS_FILE, PROJECTS_DIR)
+
+# Parsed shards keyed by username, reused until the shard's mtime moves
+# (saves refresh them in place, external edits invalidate them naturally).
+_PROJECTS_CACHE = {}
 
-def load_projects():
-    """Load all projects"""
-    if not os.path.exists(PROJECTS_FILE):
-        os.makedirs(os.path.dirname(PROJECTS_FILE), exist_ok=True)
+# Saves update the in-memory cache and mark the user dirty; the write itself
+# is coalesced into one per-shard flush at request teardown.
+_DIRTY_PROJECT_USERS = set()
+
+def load_user_projects(username):
+    """Load one user's projects as a {project_id: project} dict"""
+    if username in _DIRTY_PROJECT_USERS:
+        return _PROJECTS_CACHE[username][1]
+    path = _projects_path(username)
+    if not os.path.exists(path):
         return {}
     try:
-        with open(PROJECTS_FILE, 'r') as f:
-            return json.load(f)
+        mtime = os.path.getmtime(path)
+        entry = _PROJECTS_CACHE.get(username)
+        if entry is not None and entry[0] == mtime:
+            return entry[1]
+        if orjson is not None:
+            with open(path, 'rb') as f:
+                data = orjson.loads(f.read())
+        else:
+            with open(path, 'r') as f:
+                data = json.load(f)
+        if isinstance(data, list):
+            data = {p['id']: p for p in data}
+        _PROJECTS_CACHE[username] = (mtime, data)
+        return data
     except Exception as e:
-        logger.error(f"Error loading projects: {e}")
+        logger.error("Error loading projects for %s: %s", username, e)
         return {}
 
-def save_projects(projects):
-    """Save projects"""
+def save_user_projects(username, user_projects):
+    """Record one user's projects; the shard write happens at teardown."""
+    _PROJECTS_CACHE[username] = (None, user_projects)
+    _DIRTY_PROJECT_USERS.add(username)
+    if not has_request_context():
+        _flush_projects()
+
+def _flush_projects():
+    while _DIRTY_PROJECT_USERS:
+        username = _DIRTY_PROJECT_USERS.pop()
+        try:
+            os.makedirs(PROJECTS_DIR, exist_ok=True)
+            path = _projects_path(username)
+            data = _PROJECTS_CACHE[username][1]
+            _atomic_write(path, _dump_bytes(data))
+            _PROJECTS_CACHE[username] = (os.path.getmtime(path), data)
+        except Exception as e:
+            logger.error("Error saving projects for %s: %s", username, e)
+
+# Analysis payloads live in per-project sidecar files written by the
+# analysis worker; the shard record only carries repo_data_path. The single-
+# project GET re-attaches the payload so the frontend keeps its shape.
+REPO_DATA_DIR = os.path.join(_DATA_DIR, 'repo_data')
+
+def _repo_data_path(project_id):
+    return os.path.join(REPO_DATA_DIR, f'{project_id}.json')
+
+def _get_repo_data(project):
+    repo_data = project.get('repo_data')
+    if repo_data:
+        return repo_data  # legacy inline payload
+    path = project.get('repo_data_path')
+    if not path or not os.path.exists(path):
+        return None
     try:
-        os.makedirs(os.path.dirname(PROJECTS_FILE), exist_ok=True)
-        with open(PROJECTS_FILE, 'w') as f:
-            json.dump(projects, f, indent=2)
+        if orjson is not None:
+            with open(path, 'rb') as f:
+                return orjson.loads(f.read())
+        with open(path, 'r') as f:
+            return json.load(f)
     except Exception as e:
-        logger.error(f"Error saving projects: {e}")
-        raise
+        logger.error("Error loading repo data for %s: %s", project.get('id'), e)
+        return None
+
+def _shard_etag(path):
+    """ETag for a shard's persisted state, derived from its stat.
+
+    mtime_ns+size changes whenever a flush lands, so a matching
+    If-None-Match means the client's copy is current and the handler can
+    skip serialization entirely.
+    """
+    try:
+        st = os.stat(path)
+        return f'{st.st_mtime_ns}-{st.st_size}'
+    except OSError:
+        return None
+
+@projects_bp.teardown_app_request
+def _flush_projects_on_teardown(exc):
+    _flush_projects()
+
+atexit.register(_flush_projects)
+
+# Compiled once; this sits on the project-creation hot path
+_GITHUB_URL_RE = re.compile(r'^https://github\.com/[\w\-]+/[\w\-\.]+/?$')
 
 def validate_github_url(url):
     """Validate GitHub URL format"""
-    github_pattern = r'^https://github\.com/[\w\-]+/[\w\-\.]+/?$'
-    if not re.match(github_pattern, url):
-        return False, "Invalid GitHub URL format (expected: https://github.com/user/repo)"
+    # length check first: pathological inputs never reach the regex
     if len(url) > 255:
         return False, "GitHub URL cannot exceed 255 characters"
+    if not _GITHUB_URL_RE.match(url):
+        return False, "Invalid GitHub URL format (expected: https://github.com/user/repo)"
     return True, None
 
 def validate_project_name(name):
@@ -57,16 +193,22 @@ def get_projects():
     """Get all projects for current user"""
     try:
         username = get_jwt_identity()
-        projects = load_projects()
-        
-        user_projects = projects.get(username, [])
-        
+
+        etag = _shard_etag(_projects_path(username))
+        if etag and etag in request.if_none_match:
+            return '', 304
+
+        user_projects = list(load_user_projects(username).values())
+
         logger.debug(f"Retrieved {len(user_projects)} projects for user: {username}")
-        
-        return jsonify({
+
+        response = jsonify({
             'projects': user_projects,
             'total': len(user_projects)
-        }), 200
+        })
+        if etag:
+            response.set_etag(etag)
+        return response, 200
         
     except Exception as e:
         logger.error(f"Error retrieving projects: {e}", exc_info=True)
@@ -78,17 +220,19 @@ def get_project(project_id):
     """Get single project"""
     try:
         username = get_jwt_identity()
-        projects = load_projects()
-        
-        user_projects = projects.get(username, [])
-        project = next((p for p in user_projects if p['id'] == project_id), None)
-        
+        project = load_user_projects(username).get(project_id)
+
         if not project:
             logger.warning(f"Project not found: {project_id} for user: {username}")
             return jsonify({'error': 'Project not found'}), 404
         
         logger.debug(f"Retrieved project: {project_id} for user: {username}")
-        
+
+        repo_data = _get_repo_data(project)
+        if repo_data is not None and not project.get('repo_data'):
+            # copy so the slim shard record itself never grows the payload
+            project = {**project, 'repo_data': repo_data}
+
         return jsonify(project), 200
         
     except Exception as e:
@@ -123,11 +267,8 @@ def create_project():
             logger.warning(f"Invalid GitHub URL: {error_msg}")
             return jsonify({'error': error_msg}), 400
         
-        projects = load_projects()
-        
-        if username not in projects:
-            projects[username] = []
-        
+        user_projects = load_user_projects(username)
+
         # Create project with unique ID
         project = {
             'id': str(uuid.uuid4()),
@@ -140,8 +281,8 @@ def create_project():
             'analysis': None
         }
         
-        projects[username].append(project)
-        save_projects(projects)
+        user_projects[project['id']] = project
+        save_user_projects(username, user_projects)
         
         logger.info(f"Project created successfully: {project['id']} by {username}")
         
@@ -164,14 +305,12 @@ def update_project(project_id):
         username = get_jwt_identity()
         data = request.get_json()
         
-        projects = load_projects()
-        user_projects = projects.get(username, [])
-        
-        project = next((p for p in user_projects if p['id'] == project_id), None)
-        
+        user_projects = load_user_projects(username)
+        project = user_projects.get(project_id)
+
         if not project:
             return jsonify({'error': 'Project not found'}), 404
-        
+
         # Update allowed fields
         if 'name' in data:
             project['name'] = data['name'].strip()
@@ -183,8 +322,8 @@ def update_project(project_id):
             project['analysis'] = data['analysis']
         
         project['updated_at'] = datetime.now().isoformat()
-        
-        save_projects(projects)
+
+        save_user_projects(username, user_projects)
         
         return jsonify({
             'message': 'Project updated successfully',
@@ -200,17 +339,17 @@ def delete_project(project_id):
     """Delete project"""
     try:
         username = get_jwt_identity()
-        projects = load_projects()
-        
-        user_projects = projects.get(username, [])
-        
-        initial_count = len(user_projects)
-        projects[username] = [p for p in user_projects if p['id'] != project_id]
-        
-        if len(projects[username]) == initial_count:
+        user_projects = load_user_projects(username)
+
+        if user_projects.pop(project_id, None) is None:
             return jsonify({'error': 'Project not found'}), 404
-        
-        save_projects(projects)
+
+        save_user_projects(username, user_projects)
+
+        try:
+            os.remove(_repo_data_path(project_id))
+        except OSError:
+            pass  # never analyzed, or already gone
         
         return jsonify({'message': 'Project deleted successfully'}), 200
         
@@ -223,14 +362,11 @@ def get_project_status(project_id):
     """Get project analysis status"""
     try:
         username = get_jwt_identity()
-        projects = load_projects()
-        
-        user_projects = projects.get(username, [])
-        project = next((p for p in user_projects if p['id'] == project_id), None)
-        
+        project = load_user_projects(username).get(project_id)
+
         if not project:
             return jsonify({'error': 'Project not found'}), 404
-        
+
         return jsonify({
             'project_id': project_id,
             'status': project.get('status', 'pending'),
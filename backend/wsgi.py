@@ -0,0 +1,3 @@
+# backend/wsgi.py
+# WSGI entry point: gunicorn -c gunicorn.conf.py wsgi:app
+from app import app  # noqa: F401
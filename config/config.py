@@ -16,6 +16,7 @@ qdrant = QdrantClient(url=QDRANT_URL, api_key=QDRANT_API_KEY)
 import cohere # type: ignore
 COHERE_API_KEY = os.getenv("COHERE_API_KEY")
 co = cohere.Client(COHERE_API_KEY)
+aco = cohere.AsyncClient(COHERE_API_KEY)
 
 # Jina
 JINA_API_KEY = os.getenv("JINA_API_KEY")
@@ -140,6 +140,10 @@ class APIClient {
         });
     }
 
+    async getAnalysisJob(jobId) {
+        return this.request(`/analysis/job/${jobId}`, 'GET');
+    }
+
     async getRepoAnalysis(projectId) {
         return this.request(`/analysis/analyze-repo/${projectId}`, 'GET');
     }
@@ -160,6 +164,10 @@ class APIClient {
         return this.request('/generation/articles/user/all', 'GET');
     }
 
+    async getGenerationJob(jobId) {
+        return this.request(`/generation/job/${jobId}`, 'GET');
+    }
+
     async generateOutline(projectId, instructions) {
         return this.request('/generation/outline', 'POST', {
             project_id: projectId,
@@ -188,7 +196,25 @@ class APIClient {
     }
 
     async downloadArticle(articleId, format = 'markdown') {
-        return this.request(`/generation/article/${articleId}/download?format=${format}`, 'GET');
+        // The markdown download is a raw text/markdown attachment, not JSON,
+        // so it can't go through request(); fetch it directly and hand back
+        // the body as text. Errors still arrive as JSON from the backend.
+        const headers = {};
+        if (this.accessToken) {
+            headers['Authorization'] = `Bearer ${this.accessToken}`;
+        }
+        const response = await fetch(
+            `${API_BASE_URL}/generation/article/${articleId}/download?format=${format}`,
+            { method: 'GET', headers }
+        );
+        if (!response.ok) {
+            const data = await response.json().catch(() => ({}));
+            throw new Error(data.error || `HTTP ${response.status}`);
+        }
+        if (format === 'json') {
+            return response.json();
+        }
+        return response.text();
     }
 
     /**
@@ -320,8 +320,16 @@ async function analyzeProject(projectId) {
         // Get project details
         const project = await api.getProject(projectId);
 
-        // Download and analyze repository
-        await api.downloadAndAnalyzeRepo(project.github_url, projectId);
+        // Download and analyze repository (runs server-side in the
+        // background; poll the job until it settles)
+        let job = await api.downloadAndAnalyzeRepo(project.github_url, projectId);
+        while (job.job_id && (job.status === 'queued' || job.status === 'running')) {
+            await new Promise(resolve => setTimeout(resolve, 2000));
+            job = await api.getAnalysisJob(job.job_id);
+        }
+        if (job.status === 'failed') {
+            throw new Error(job.error || 'Analysis failed');
+        }
         hideLoading();
 
         showToast('Repository analyzed successfully!', 'success');
@@ -423,8 +431,16 @@ async function loadProjectForGeneration() {
         if (structure.directory_tree && typeof structure.directory_tree === 'object' && Object.keys(structure.directory_tree).length > 0) {
             const treeHTML = formatDirectoryTree(structure.directory_tree);
             repoStructureDiv.innerHTML = treeHTML;
+        } else if (analysis.structure_preview) {
+            // Preview string is precomputed server-side at analysis time
+            const extra = analysis.preview_extra_count > 0 ? '<br>... and ' + analysis.preview_extra_count + ' more files' : '';
+            repoStructureDiv.innerHTML = `<div style="font-size: 12px;">${analysis.structure_preview.split('\n').join('<br>')}${extra}</div>`;
+        } else if (structure.paths && structure.paths.length > 0) {
+            // Fallback: flat path list if directory_tree is not available
+            const fileList = structure.paths.slice(0, 20).map(p => `📄 ${p}`).join('<br>');
+            repoStructureDiv.innerHTML = `<div style="font-size: 12px;">${fileList}${structure.paths.length > 20 ? '<br>... and ' + (structure.paths.length - 20) + ' more files' : ''}</div>`;
         } else if (structure.files && structure.files.length > 0) {
-            // Fallback: show file list if directory_tree is not available
+            // Legacy fallback for projects analyzed before the flat layout
             const fileList = structure.files.slice(0, 20).map(f => `📄 ${f.path}`).join('<br>');
             repoStructureDiv.innerHTML = `<div style="font-size: 12px;">${fileList}${structure.files.length > 20 ? '<br>... and ' + (structure.files.length - 20) + ' more files' : ''}</div>`;
         } else {
@@ -454,7 +470,19 @@ async function generateOutline() {
 
     try {
         showLoading();
-        const response = await api.generateOutline(currentProjectId, instructions);
+        let response = await api.generateOutline(currentProjectId, instructions);
+
+        // Generation runs server-side as a job; poll until it settles
+        while (response.job_id && (response.status === 'queued' || response.status === 'running')) {
+            await new Promise(resolve => setTimeout(resolve, 2000));
+            response = await api.getGenerationJob(response.job_id);
+        }
+        if (response.status === 'failed') {
+            throw new Error(response.error || 'Outline generation failed');
+        }
+        if (response.result) {
+            response = response.result;
+        }
         hideLoading();
 
         document.getElementById('outline-content').innerHTML = renderMarkdown(response.outline);
@@ -484,7 +512,19 @@ async function generateArticle() {
 
     try {
         showLoading();
-        const response = await api.generateArticle(currentProjectId, instructions, description);
+        let response = await api.generateArticle(currentProjectId, instructions, description);
+
+        // Generation runs server-side as a job; poll until it settles
+        while (response.job_id && (response.status === 'queued' || response.status === 'running')) {
+            await new Promise(resolve => setTimeout(resolve, 2000));
+            response = await api.getGenerationJob(response.job_id);
+        }
+        if (response.status === 'failed') {
+            throw new Error(response.error || 'Article generation failed');
+        }
+        if (response.result) {
+            response = response.result;
+        }
         hideLoading();
 
         currentArticleId = response.article_id;
@@ -0,0 +1,11 @@
+# gunicorn.conf.py
+# Pre-forked threaded serving for the backend: clone+analyze requests are
+# I/O-bound, so threads per worker buy concurrency cheaply.
+import os
+
+chdir = "backend"
+bind = "0.0.0.0:5000"
+workers = max(2, os.cpu_count() or 2)
+threads = 8
+worker_class = "gthread"
+timeout = 300  # clones of large repositories are slow
@@ -3,6 +3,7 @@ from langgraph.graph import StateGraph # type: ignore
 from typing import TypedDict, Optional
 from agents import repo_analyzer, embedding_agent, metadata_recommender, content_improver, reviewer
 from agents.embedding_agent import EmbeddingAgent
+from agents.reviewer import ReviewResult
 from tools.text_splitter import split_text
 
 class PipelineState(TypedDict):
@@ -10,22 +11,29 @@ class PipelineState(TypedDict):
     repo_summary: Optional[dict]
     metadata: Optional[dict]
     improved: Optional[dict]
-    review: Optional[dict]
+    review: Optional[ReviewResult]
 
 def analyze_repo(state: PipelineState) -> PipelineState:
     summary = repo_analyzer.analyze_repo(state["repo_path"])
     return {"repo_summary": summary}
 
+# Built once per process: EmbeddingAgent.__init__ round-trips to Qdrant to
+# ensure the collection exists, which repeated pipeline runs need not repeat.
+_EMB_AGENT = None
+
+def _get_embedding_agent() -> EmbeddingAgent:
+    global _EMB_AGENT
+    if _EMB_AGENT is None:
+        _EMB_AGENT = EmbeddingAgent()
+    return _EMB_AGENT
+
 def embed_repo(state: PipelineState) -> PipelineState:
     summary = state["repo_summary"]
-    emb = EmbeddingAgent()
-    chunks = []
-    metas = []
-    for f in summary["files"]:
-        parts = split_text(f["content"])
-        for p in parts:
-            chunks.append(p)
-            metas.append({"source": f["path"]})
+    emb = _get_embedding_agent()
+    # flatten in comprehensions (C-level loop) instead of paired appends
+    pairs = [(p, f["path"]) for f in summary["files"] for p in split_text(f["content"])]
+    chunks = [p for p, _ in pairs]
+    metas = [{"source": path} for _, path in pairs]
     print(f"Embedding {len(chunks)} chunks ...")
     emb.add_texts(chunks, metadata_list=metas)
     return {}  # no change to state
@@ -52,9 +60,11 @@ graph.add_node("improve", improve_content)
 graph.add_node("review", review_content)
 
 graph.set_entry_point("analyze")
+# embed (Qdrant upsert) and metadata (LLM call) both depend only on the
+# analysis, so they fan out in parallel; improve joins on both.
 graph.add_edge("analyze", "embed")
-graph.add_edge("embed", "metadata")
-graph.add_edge("metadata", "improve")
+graph.add_edge("analyze", "metadata")
+graph.add_edge(["embed", "metadata"], "improve")
 graph.add_edge("improve", "review")
 graph.add_edge("review", "__end__")
 
@@ -7,7 +7,7 @@ from datetime import datetime
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../'))
 
 
-@pytest.fixture(scope='function')
+@pytest.fixture(scope='module')
 def client():
     """Flask test client for end-to-end tests"""
     from backend.app import app
@@ -19,7 +19,7 @@ def client():
         yield client
 
 
-@pytest.fixture(scope='function')
+@pytest.fixture(scope='module')
 def test_user():
     """Fixture for test user data"""
     timestamp = int(datetime.now().timestamp() * 1000)
@@ -30,9 +30,15 @@ def test_user():
     }
 
 
-@pytest.fixture(scope='function')
+@pytest.fixture(scope='module')
 def authenticated_client(client, test_user):
-    """Flask test client with authenticated user"""
+    """Flask test client with authenticated user
+
+    Module-scoped: the register + login (and the deliberately slow password
+    hash behind them) run once per test module instead of once per test.
+    Tests assert against their own project/article ids, so sharing the user
+    is safe.
+    """
     
     # Register test user
     response = client.post('/api/auth/register',
@@ -58,10 +64,45 @@ def authenticated_client(client, test_user):
     return client
 
 
-@pytest.fixture(scope='function')
+@pytest.fixture(scope='module')
 def authenticated_headers(authenticated_client):
     """Get authenticated headers from client"""
     return {
         'Authorization': f'Bearer {authenticated_client.token}',
         'Content-Type': 'application/json'
     }
+
+
+@pytest.fixture
+def seed_projects(authenticated_client):
+    """Insert projects straight into the per-user store, bypassing HTTP.
+
+    For tests that only care about the final state, this skips one JWT
+    decode + validation pass per project. There is no bulk endpoint, so the
+    helper writes through the same load/save pair the routes use.
+    """
+    import uuid
+
+    def _seed(count):
+        from backend.routes.projects import load_user_projects, save_user_projects
+
+        username = authenticated_client.test_user['username']
+        user_projects = load_user_projects(username)
+        ids = []
+        for i in range(count):
+            project = {
+                'id': str(uuid.uuid4()),
+                'name': f'Seeded Project {i}',
+                'github_url': f'https://github.com/test/seeded{i}',
+                'description': '',
+                'created_at': datetime.now().isoformat(),
+                'status': 'pending',
+                'repo_data': None,
+                'analysis': None
+            }
+            user_projects[project['id']] = project
+            ids.append(project['id'])
+        save_user_projects(username, user_projects)
+        return ids
+
+    return _seed
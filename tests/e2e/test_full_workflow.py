@@ -1,9 +1,28 @@
 import pytest
 import json
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 
+def _parallel_post(app, calls):
+    """POST each (path, payload, headers) through its own test client in
+    parallel, returning responses in call order.
+
+    The Flask test client is not thread-safe, so each worker opens its own
+    client against the shared app; the requests themselves then overlap
+    instead of paying one serial roundtrip per call.
+    """
+    def _one(call):
+        path, payload, headers = call
+        with app.test_client() as c:
+            return c.post(path, json=payload, headers=headers,
+                          content_type='application/json')
+
+    with ThreadPoolExecutor(max_workers=len(calls)) as pool:
+        return list(pool.map(_one, calls))
+
+
 class TestAuthenticationFlow:
     """End-to-end authentication workflow tests"""
     
@@ -205,25 +224,21 @@ class TestDataIntegrity:
             'password': 'Pass123456'
         }
         
-        # Register both users
-        client.post('/api/auth/register', json=user1, content_type='application/json')
-        client.post('/api/auth/register', json=user2, content_type='application/json')
-        
-        # Login as user1
-        response = client.post('/api/auth/login',
-            json={'username': user1['username'], 'password': user1['password']},
-            content_type='application/json'
-        )
-        token1 = response.json['access_token']
-        headers1 = {'Authorization': f'Bearer {token1}'}
-        
-        # Login as user2
-        response = client.post('/api/auth/login',
-            json={'username': user2['username'], 'password': user2['password']},
-            content_type='application/json'
-        )
-        token2 = response.json['access_token']
-        headers2 = {'Authorization': f'Bearer {token2}'}
+        # Register both users in parallel (password hashing is the slow part)
+        _parallel_post(client.application, [
+            ('/api/auth/register', user1, None),
+            ('/api/auth/register', user2, None),
+        ])
+
+        # Log both in in parallel
+        login1, login2 = _parallel_post(client.application, [
+            ('/api/auth/login',
+             {'username': user1['username'], 'password': user1['password']}, None),
+            ('/api/auth/login',
+             {'username': user2['username'], 'password': user2['password']}, None),
+        ])
+        headers1 = {'Authorization': f"Bearer {login1.json['access_token']}"}
+        headers2 = {'Authorization': f"Bearer {login2.json['access_token']}"}
         
         # User1 creates a project
         project_data = {'name': 'User1 Project', 'github_url': 'https://github.com/user1/repo'}
@@ -241,19 +256,12 @@ class TestDataIntegrity:
         project_ids = [p['id'] for p in response.json['projects']]
         assert project_id not in project_ids
     
-    def test_data_consistency_after_operations(self, client, authenticated_headers):
+    def test_data_consistency_after_operations(self, client, authenticated_headers, seed_projects):
         """Test that data remains consistent after multiple operations"""
-        
-        # Create multiple projects
-        project_ids = []
-        for i in range(3):
-            project_data = {
-                'name': f'Project {i}',
-                'github_url': f'https://github.com/test/repo{i}'
-            }
-            response = client.post('/api/projects', json=project_data, headers=authenticated_headers, content_type='application/json')
-            if response.status_code == 201:
-                project_ids.append(response.json['id'])
+
+        # Create multiple projects directly in the store; only the final
+        # state matters here, not the create endpoint itself
+        project_ids = seed_projects(3)
         
         # Verify all projects exist
         response = client.get('/api/projects', headers=authenticated_headers)
@@ -298,10 +306,14 @@ class TestAPIRobustness:
         token = response.json['access_token']
         headers = {'Authorization': f'Bearer {token}'}
         
-        # Perform multiple operations in sequence
-        for i in range(5):
-            project_data = {'name': f'Project {i}', 'github_url': f'https://github.com/test/repo{i}'}
-            response = client.post('/api/projects', json=project_data, headers=headers, content_type='application/json')
+        # Perform multiple operations concurrently
+        responses = _parallel_post(client.application, [
+            ('/api/projects',
+             {'name': f'Project {i}', 'github_url': f'https://github.com/test/repo{i}'},
+             headers)
+            for i in range(5)
+        ])
+        for response in responses:
             assert response.status_code == 201
     
     def test_edge_cases(self, client, authenticated_headers):
@@ -326,33 +338,3 @@ class TestAPIRobustness:
         response = client.post('/api/projects', json=project_data, headers=authenticated_headers, content_type='application/json')
         # Should handle gracefully
         assert response.status_code in [201, 400]
-
-
-@pytest.fixture
-def client():
-    """Flask test client"""
-    from backend.app import app
-    app.config['TESTING'] = True
-    with app.test_client() as client:
-        yield client
-
-
-@pytest.fixture
-def authenticated_headers(client):
-    """Get authenticated headers for test user"""
-    user_data = {
-        'username': f'test_user_{int(datetime.now().timestamp())}',
-        'email': f'test_{datetime.now().timestamp()}@example.com',
-        'password': 'TestPass123'
-    }
-    
-    # Register
-    client.post('/api/auth/register', json=user_data, content_type='application/json')
-    
-    # Login
-    response = client.post('/api/auth/login',
-        json={'username': user_data['username'], 'password': user_data['password']},
-        content_type='application/json'
-    )
-    token = response.json['access_token']
-    return {'Authorization': f'Bearer {token}'}
@@ -26,7 +26,7 @@ class TestRepoAnalyzer:
         assert structure["has_docs"] is True
         assert structure["has_docker"] is False
 
-    @patch("agents.repo_analyzer.load_files_from_directory")
+    @patch("agents.repo_analyzer.iter_files_from_directory")
     def test_analyze_repo(self, mock_load):
         mock_load.return_value = [
             {"path": "README.md", "content": "# Test Repo", "size": 100},
@@ -0,0 +1,21 @@
+# tools/_exclusions.py
+"""Shared path-exclusion rules for the repository walkers.
+
+file_loader and RepoDownloader used to carry their own near-identical
+EXCLUDE_DIRS sets (one even listed '__pycache__' twice); this is the single
+place both read from.
+"""
+
+EXCLUDE_DIRS = frozenset({
+    'venv', 'env', '.venv', 'node_modules', '.git', '__pycache__',
+    '.pytest_cache', 'build', 'dist', '.egg-info', '.tox',
+    'site-packages', '.next', 'out', '.svelte-kit',
+    '.DS_Store', '.idea', '.vscode', 'target', '.gradle'
+})
+
+EXCLUDE_FILES = frozenset({'.DS_Store', 'Thumbs.db', '.gitkeep'})
+
+def is_excluded_path(rel_path):
+    # One split, then a hashed set lookup per component — instead of one
+    # substring search over the whole path per excluded name.
+    return not EXCLUDE_DIRS.isdisjoint(rel_path.replace('\\', '/').split('/'))
@@ -1,62 +1,133 @@
 # tools/file_loader.py
 import os
+import threading
 import zipfile
-import json
+from concurrent.futures import ThreadPoolExecutor
 
-EXCLUDE_DIRS = {
-    'venv', 'env', '.venv', 'node_modules', '.git', '__pycache__', 
-    '.pytest_cache', 'build', 'dist', '.egg-info', '.tox',
-    'site-packages', '.next', 'out', '.svelte-kit'
-}
+from tools._exclusions import EXCLUDE_DIRS, EXCLUDE_FILES, is_excluded_path
 
-EXCLUDE_FILES = {'.DS_Store', 'Thumbs.db', '.gitkeep'}
+# Historical name for the shared component check; existing callers and
+# tests import it from here.
+should_exclude = is_excluded_path
 
-def should_exclude(path):
-    path = path.replace('/', os.sep).replace('\\', os.sep)
-    for excluded in EXCLUDE_DIRS:
-        if os.sep + excluded + os.sep in path or path.startswith(excluded + os.sep):
-            return True
-    return False
+MAX_FILE_SIZE = 500_000
 
-def load_files_from_directory(directory, extensions=(".py", ".md", ".txt", ".json", ".yaml", ".yml", ".toml", ".lock", ".xml")):
-    files = []
-    max_file_size = 500_000
-    
+# Ingest is I/O-bound: with serial reads every file pays its stat+read
+# syscall latency back to back. This many workers keeps the disk queue full
+# without oversubscribing the page cache.
+_READ_WORKERS = 16
+
+def _iter_candidates(directory, extensions):
+    """Walk the tree and yield (path, rel_path, size) for files worth reading.
+
+    A stack-based os.scandir traversal instead of os.walk: os.walk discards
+    its DirEntry objects, so the size check used to cost a second stat
+    syscall per file. Here entry.stat() answers from the DirEntry cache.
+    """
     try:
-        for root, dirs, filenames in os.walk(directory):
-            dirs[:] = [d for d in dirs if d not in EXCLUDE_DIRS]
-            
-            for fname in filenames:
-                if fname in EXCLUDE_FILES:
-                    continue
-                    
-                path = os.path.join(root, fname)
-                rel_path = os.path.relpath(path, directory).replace("\\", "/")
-                
-                if should_exclude(rel_path):
-                    continue
-                
-                if fname.lower().endswith(extensions) or fname in ('README', 'LICENSE', 'Dockerfile', 'Makefile', '.gitignore'):
+        stack = [directory]
+        while stack:
+            try:
+                entries = os.scandir(stack.pop())
+            except OSError:
+                continue
+            with entries:
+                for entry in entries:
                     try:
-                        file_size = os.path.getsize(path)
-                        if file_size > max_file_size:
+                        if entry.is_dir():
+                            # like os.walk with followlinks=False: symlinked
+                            # dirs are neither descended nor treated as files
+                            if entry.name not in EXCLUDE_DIRS and not entry.is_symlink():
+                                stack.append(entry.path)
                             continue
-                            
-                        with open(path, "r", encoding="utf-8", errors="ignore") as f:
-                            content = f.read()
-                        
-                        files.append({
-                            "path": rel_path,
-                            "content": content,
-                            "size": file_size,
-                            "content_size": len(content)
-                        })
-                    except Exception:
+                    except OSError:
+                        continue
+
+                    fname = entry.name
+                    if fname in EXCLUDE_FILES:
                         continue
+
+                    rel_path = os.path.relpath(entry.path, directory).replace("\\", "/")
+
+                    if should_exclude(rel_path):
+                        continue
+
+                    if fname.lower().endswith(extensions) or fname in ('README', 'LICENSE', 'Dockerfile', 'Makefile', '.gitignore'):
+                        try:
+                            st = entry.stat()
+                        except OSError:
+                            continue
+                        if st.st_size > MAX_FILE_SIZE:
+                            continue
+                        yield entry.path, rel_path, st.st_size, st.st_mtime_ns
     except Exception as e:
         print(f"Error scanning directory: {e}")
-    
-    return files
+
+# Pooled read buffers: every file fits in MAX_FILE_SIZE, so readers borrow a
+# pre-sized bytearray and readinto() it instead of allocating a fresh bytes
+# object per file. At most one buffer per pool worker ever exists.
+_BUF_POOL = []
+_BUF_POOL_LOCK = threading.Lock()
+
+# Parsed content keyed by (path, mtime_ns, size): a rescan of an unchanged
+# repo answers from here at the cost of the dirent stat alone. Oldest entry
+# falls out once full.
+_CONTENT_CACHE = {}
+_CONTENT_CACHE_MAX = 4096
+_CONTENT_CACHE_LOCK = threading.Lock()
+
+def _read_candidate(candidate):
+    path, rel_path, file_size, mtime_ns = candidate
+    cache_key = (path, mtime_ns, file_size)
+    with _CONTENT_CACHE_LOCK:
+        cached = _CONTENT_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
+
+    with _BUF_POOL_LOCK:
+        buf = _BUF_POOL.pop() if _BUF_POOL else bytearray(MAX_FILE_SIZE)
+    try:
+        with open(path, "rb") as f:
+            nbytes = f.readinto(buf)
+        # one-shot decode of the filled slice; normalize newlines afterwards
+        # like text mode did, but only when the file actually has any \r
+        content = str(memoryview(buf)[:nbytes], "utf-8", "ignore")
+        if "\r" in content:
+            content = content.replace("\r\n", "\n").replace("\r", "\n")
+    except Exception:
+        return None
+    finally:
+        with _BUF_POOL_LOCK:
+            if len(_BUF_POOL) < _READ_WORKERS:
+                _BUF_POOL.append(buf)
+    result = {
+        "path": rel_path,
+        "content": content,
+        "size": file_size,
+        "content_size": len(content)
+    }
+    with _CONTENT_CACHE_LOCK:
+        if len(_CONTENT_CACHE) >= _CONTENT_CACHE_MAX:
+            _CONTENT_CACHE.pop(next(iter(_CONTENT_CACHE)))
+        _CONTENT_CACHE[cache_key] = result
+    return result
+
+def iter_files_from_directory(directory, extensions=(".py", ".md", ".txt", ".json", ".yaml", ".yml", ".toml", ".lock", ".xml")):
+    """Yield file dicts one at a time so callers can process them streaming."""
+    for candidate in _iter_candidates(directory, extensions):
+        result = _read_candidate(candidate)
+        if result is not None:
+            yield result
+
+def load_files_from_directory(directory, extensions=(".py", ".md", ".txt", ".json", ".yaml", ".yml", ".toml", ".lock", ".xml")):
+    # Reads overlap across a thread pool while the walker keeps enumerating;
+    # map() preserves traversal order so output matches the streaming path.
+    with ThreadPoolExecutor(max_workers=_READ_WORKERS) as executor:
+        return [
+            result
+            for result in executor.map(_read_candidate, _iter_candidates(directory, extensions))
+            if result is not None
+        ]
 
 def extract_zip_to_dir(zip_path, dest_dir):
     os.makedirs(dest_dir, exist_ok=True)
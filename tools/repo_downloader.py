@@ -1,22 +1,40 @@
 import os
+import json
+import random
+import subprocess
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+import time
 import tempfile
 import shutil
 import stat
 from pathlib import Path
-from git import Repo
+import requests
+from git import Git
+
+from tools._exclusions import EXCLUDE_DIRS
 
 
 class RepoDownloader:
     """Downloads and manages GitHub repositories."""
-    
-    EXCLUDE_DIRS = {
-        'venv', 'env', '.venv', 'node_modules', '.git', '__pycache__',
-        '.pytest_cache', 'build', 'dist', '.egg-info', '.tox', '.next',
-        'out', '.svelte-kit', '.DS_Store', '.idea', '.vscode',
-        'target', '.gradle', '__pycache__'
-    }
-    
+
+    EXCLUDE_DIRS = EXCLUDE_DIRS
+
     MAX_FILE_SIZE = 500 * 1024  # 500KB
+
+    # Re-cloning the same commit is pure network waste: a one-round-trip
+    # ls-remote resolves the remote HEAD, and an on-disk index maps
+    # (url, sha) to an existing checkout for this long.
+    CLONE_TTL_SECONDS = 24 * 3600
+
+    # Within this window even the ls-remote round trip is skipped: a URL
+    # cloned moments ago is served from memory without touching the network.
+    RECENT_CLONE_TTL_SECONDS = 600
+
+    # GitHub API quota handling: probe at most once a minute, back off with
+    # jitter when nearly exhausted, and never block longer than this.
+    RATE_LIMIT_PROBE_INTERVAL = 60
+    RATE_LIMIT_MAX_SLEEP = 300
     
     def __init__(self, cache_dir: str = None):
         """Initialize downloader with optional cache directory."""
@@ -24,7 +42,89 @@ class RepoDownloader:
             cache_dir = os.path.join(tempfile.gettempdir(), "repo_cache")
         
         self.cache_dir = cache_dir
+        # HEAD commit of the most recent clone; callers use it as a cache key
+        self.last_head_sha = None
+        self.index_path = os.path.join(cache_dir, "clones.json")
+        # url -> (path, sha, monotonic timestamp); see RECENT_CLONE_TTL_SECONDS
+        self._recent_clones = {}
+        self._rate_limit_checked_at = 0.0
         os.makedirs(cache_dir, exist_ok=True)
+
+    def _respect_rate_limit(self, github_url: str):
+        """Probe GitHub's rate limit and back off with jitter when nearly spent.
+
+        Anonymous clients get 60 requests/hour; a burst of analyze clicks can
+        silently exhaust that. Probes are throttled to once a minute and the
+        probe itself is best-effort.
+        """
+        if time.time() - self._rate_limit_checked_at < self.RATE_LIMIT_PROBE_INTERVAL:
+            return
+        parts = self._normalize_url(github_url).split('/')
+        if len(parts) < 5 or 'github.com' not in parts[2]:
+            return
+        owner, repo_name = parts[3], parts[4]
+        try:
+            headers = {}
+            token = os.getenv('GH_TOKEN')
+            if token:
+                headers['Authorization'] = f"Bearer {token}"
+            resp = requests.get(
+                f"https://api.github.com/repos/{owner}/{repo_name}",
+                headers=headers, timeout=5
+            )
+            remaining = int(resp.headers.get('X-RateLimit-Remaining', '999'))
+            if remaining < 5:
+                reset = int(resp.headers.get('X-RateLimit-Reset', '0'))
+                delay = max(0.0, reset - time.time()) + random.uniform(0, 2)
+                time.sleep(min(delay, self.RATE_LIMIT_MAX_SLEEP))
+        except Exception:
+            pass
+        self._rate_limit_checked_at = time.time()
+
+    @staticmethod
+    def _normalize_url(github_url: str) -> str:
+        """Canonical form for cache keys: no trailing slash/.git, lowercased host."""
+        url = github_url.rstrip('/')
+        if url.endswith('.git'):
+            url = url[:-4]
+        scheme, sep, rest = url.partition('://')
+        if sep:
+            host, slash, path = rest.partition('/')
+            url = scheme + sep + host.lower() + slash + path
+        return url
+
+    def _resolve_remote_head(self, github_url: str) -> str:
+        """Resolve the remote HEAD SHA with one ls-remote round trip."""
+        try:
+            output = Git().ls_remote(github_url, "HEAD")
+            return output.split()[0] if output else None
+        except Exception:
+            return None
+
+    def _load_index(self) -> dict:
+        try:
+            with open(self.index_path, 'r') as f:
+                return json.load(f)
+        except Exception:
+            return {}
+
+    def _index_lookup(self, url: str, sha: str) -> str:
+        """Return a cached checkout path for (url, sha), or None."""
+        entry = self._load_index().get(url)
+        if (entry and entry.get("sha") == sha
+                and time.time() - entry.get("ts", 0) < self.CLONE_TTL_SECONDS
+                and os.path.isdir(entry.get("path", ""))):
+            return entry["path"]
+        return None
+
+    def _index_store(self, url: str, sha: str, repo_path: str):
+        index = self._load_index()
+        index[url] = {"sha": sha, "path": repo_path, "ts": time.time()}
+        try:
+            with open(self.index_path, 'w') as f:
+                json.dump(index, f)
+        except Exception:
+            pass
     
     def _handle_remove_readonly(self, func, path, exc):
         """Handle read-only files on Windows during deletion."""
@@ -34,36 +134,176 @@ class RepoDownloader:
         else:
             raise
     
-    def clone_repo(self, github_url: str) -> str:
-        """Clone GitHub repository and return local path."""
-        
+    # One query fetching exactly the preview fields (languages + two tree
+    # levels); previews don't need the clone at all.
+    _PEEK_QUERY = """
+    query($o: String!, $n: String!) {
+      repository(owner: $o, name: $n) {
+        languages(first: 20) { nodes { name } }
+        object(expression: "HEAD:") {
+          ... on Tree {
+            entries {
+              name type
+              object { ... on Tree { entries { name type } } }
+            }
+          }
+        }
+      }
+    }
+    """
+
+    def peek_via_graphql(self, github_url: str) -> dict:
+        """Fetch a structure preview with one GraphQL query instead of a clone.
+
+        Returns {"languages": [...], "paths": [...]} or None when the query
+        cannot be made (no token, non-GitHub URL, network failure).
+        """
+        token = os.getenv('GH_TOKEN')
+        if not token:
+            return None
+        parts = self._normalize_url(github_url).split('/')
+        if len(parts) < 5 or 'github.com' not in parts[2]:
+            return None
+        try:
+            resp = requests.post(
+                "https://api.github.com/graphql",
+                json={"query": self._PEEK_QUERY,
+                      "variables": {"o": parts[3], "n": parts[4]}},
+                headers={"Authorization": f"Bearer {token}"},
+                timeout=10
+            )
+            repo = resp.json()["data"]["repository"]
+            paths = []
+            for entry in (repo.get("object") or {}).get("entries", []):
+                if entry["type"] == "tree":
+                    subentries = (entry.get("object") or {}).get("entries") or []
+                    paths.extend(f"{entry['name']}/{sub['name']}" for sub in subentries)
+                else:
+                    paths.append(entry["name"])
+            return {
+                "languages": [n["name"] for n in repo["languages"]["nodes"]],
+                "paths": paths,
+            }
+        except Exception:
+            return None
+
+    def clone_repo(self, github_url: str, paths: list = None) -> str:
+        """Clone GitHub repository and return local path.
+
+        When `paths` is given, only those top-level paths are materialized
+        via a blob-filtered sparse checkout: the server then sends just the
+        blobs the checkout touches instead of the whole tree.
+        """
+
         # Validate URL
         if not github_url.startswith(('https://', 'http://')):
             raise ValueError("Invalid GitHub URL")
-        
-        # Extract repo name
-        repo_name = github_url.rstrip('/').split('/')[-1].replace('.git', '')
-        repo_path = os.path.join(self.cache_dir, repo_name)
-        
+
+        # A URL cloned within the last few minutes is served straight from
+        # memory: no rate-limit probe, no ls-remote round trip. HEAD moving
+        # inside that window just means one slightly stale snapshot.
+        normalized_url = self._normalize_url(github_url)
+        recent = self._recent_clones.get(normalized_url)
+        if recent is not None:
+            path, sha, ts = recent
+            if (time.monotonic() - ts < self.RECENT_CLONE_TTL_SECONDS
+                    and os.path.isdir(path)):
+                self.last_head_sha = sha
+                return path
+            del self._recent_clones[normalized_url]
+
+        self._respect_rate_limit(github_url)
+
+        # Serve an existing checkout when the remote HEAD hasn't moved (a
+        # full checkout is a superset of any sparse request)
+        remote_sha = self._resolve_remote_head(github_url)
+        if remote_sha:
+            cached_path = self._index_lookup(normalized_url, remote_sha)
+            if cached_path:
+                self.last_head_sha = remote_sha
+                self._recent_clones[normalized_url] = (cached_path, remote_sha, time.monotonic())
+                return cached_path
+
+        # Checkout directory keyed by the full normalized URL (host/owner/name),
+        # matching the index key: keyed by basename alone, owner1/name and
+        # owner2/name would share one directory, and owner1's still-valid
+        # index entry would serve owner2's tree after a re-clone.
+        repo_slug = normalized_url.partition('://')[2].replace('/', '__')
+        repo_path = os.path.join(self.cache_dir, repo_slug)
+        # Objects go to a scratch dir outside the working tree; cleanup then
+        # never has to walk thousands of read-only pack files inside repo_path
+        git_dir = os.path.join(self.cache_dir, '.gitdirs', repo_slug)
+
         # Remove if exists (with proper Windows handling)
-        if os.path.exists(repo_path):
-            try:
-                shutil.rmtree(repo_path, onerror=self._handle_remove_readonly)
-            except Exception as e:
-                pass
-        
-        try:
-            Repo.clone_from(github_url, repo_path)
-            
-            # Remove .git directory to save space and avoid permission issues
-            git_dir = os.path.join(repo_path, '.git')
-            if os.path.exists(git_dir):
+        for stale in (repo_path, git_dir):
+            if os.path.exists(stale):
                 try:
-                    shutil.rmtree(git_dir, onerror=self._handle_remove_readonly)
-                except Exception:
+                    shutil.rmtree(stale, onerror=self._handle_remove_readonly)
+                except Exception as e:
                     pass
-            
+        
+        try:
+            # Shallow, single-branch, tagless clone: the analyzers only read
+            # the HEAD working tree, so history and tags are pure transfer
+            # cost. LFS smudging is skipped for the same reason — pointer
+            # files are enough for a source scan. Plain subprocess instead
+            # of Repo.clone_from: the Repo object (refs, config, index
+            # reader) was built only to be discarded with .git below.
+            # git does not create the separate-git-dir parent itself
+            os.makedirs(os.path.dirname(git_dir), exist_ok=True)
+            cmd = ['git', 'clone', '--depth=1', '--single-branch', '--no-tags',
+                   f'--separate-git-dir={git_dir}']
+            if paths:
+                # with a path subset, blob filtering pays off: checkout only
+                # pulls the blobs the sparse cone touches
+                cmd += ['--filter=blob:none', '--sparse']
+            cmd += [github_url, repo_path]
+            env = {**os.environ,
+                   'GIT_LFS_SKIP_SMUDGE': '1',
+                   'GIT_TERMINAL_PROMPT': '0'}
+            subprocess.run(cmd, check=True, capture_output=True, env=env)
+            if paths:
+                subprocess.run(
+                    ['git', '-C', repo_path, 'sparse-checkout', 'set', '--cone', *paths],
+                    check=True, capture_output=True, env=env
+                )
+
+            # Record HEAD before .git is deleted so the analysis layer can
+            # key its cache on (url, commit)
+            try:
+                head = subprocess.run(
+                    ['git', '-C', repo_path, 'rev-parse', 'HEAD'],
+                    check=True, capture_output=True, text=True
+                )
+                self.last_head_sha = head.stdout.strip()
+            except Exception:
+                self.last_head_sha = None
+
+            # With --separate-git-dir, .git in the working tree is a one-line
+            # pointer file: dropping git state is a single unlink plus one
+            # rmtree of the scratch dir, instead of walking the object store
+            # in place file by file
+            try:
+                os.remove(os.path.join(repo_path, '.git'))
+            except OSError:
+                pass
+            try:
+                shutil.rmtree(git_dir, onerror=self._handle_remove_readonly)
+            except Exception:
+                pass
+
+            # Only full checkouts enter the caches; a sparse subset must
+            # never be served to a later full-tree request
+            if self.last_head_sha and not paths:
+                self._index_store(normalized_url, self.last_head_sha, repo_path)
+                self._recent_clones[normalized_url] = (
+                    repo_path, self.last_head_sha, time.monotonic()
+                )
+
             return repo_path
+        except subprocess.CalledProcessError as e:
+            detail = e.stderr.decode('utf-8', 'ignore').strip() if e.stderr else str(e)
+            raise Exception(f"Failed to clone repository: {detail}")
         except Exception as e:
             raise Exception(f"Failed to clone repository: {str(e)}")
     
@@ -75,79 +315,124 @@ class RepoDownloader:
             "files": [],
             "directories": [],
             "total_files": 0,
-            "languages": set()
+            "languages": Counter()
         }
         
-        for root, dirs, files in os.walk(repo_path):
-            # Remove excluded directories
-            dirs[:] = [d for d in dirs if d not in self.EXCLUDE_DIRS]
-            
-            # Get relative path
-            rel_path = os.path.relpath(root, repo_path)
-            depth = rel_path.count(os.sep)
-            
-            if depth > max_depth:
-                continue
-            
-            for file in files:
-                if file.startswith('.'):
-                    continue
-                
-                file_path = os.path.join(root, file)
-                file_size = os.path.getsize(file_path)
-                
-                if file_size > self.MAX_FILE_SIZE:
+        def _file_record(entry):
+            # the stat syscall is the slow part on cold cache; it runs on
+            # the pool so enumeration never waits for it
+            try:
+                file_size = entry.stat().st_size
+            except OSError:
+                return None
+            if file_size > self.MAX_FILE_SIZE:
+                return None
+            name = entry.name
+            return {
+                "path": os.path.relpath(entry.path, repo_path),
+                "name": name,
+                "extension": os.path.splitext(name)[1],
+                "size": file_size
+            }
+
+        # Stack-based os.scandir traversal: the main thread enumerates and
+        # prunes while stat + record building overlap on the pool
+        futures = []
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            stack = [(repo_path, 0)]
+            while stack:
+                current, depth = stack.pop()
+                try:
+                    entries = os.scandir(current)
+                except OSError:
                     continue
-                
-                rel_file_path = os.path.relpath(file_path, repo_path)
-                ext = os.path.splitext(file)[1]
-                
-                structure["files"].append({
-                    "path": rel_file_path,
-                    "name": file,
-                    "extension": ext,
-                    "size": file_size
-                })
-                
-                structure["total_files"] += 1
-                if ext:
-                    structure["languages"].add(ext)
-        
-        structure["languages"] = sorted(list(structure["languages"]))
+                with entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir():
+                                if entry.name not in self.EXCLUDE_DIRS and not entry.is_symlink():
+                                    # mirror os.walk's depth: top-level dirs
+                                    # sit at relative depth 0
+                                    stack.append((entry.path,
+                                                  depth + 1 if current != repo_path else 0))
+                                continue
+                        except OSError:
+                            continue
+
+                        if depth > max_depth:
+                            continue
+
+                        if entry.name.startswith('.'):
+                            continue
+
+                        futures.append(executor.submit(_file_record, entry))
+
+        for future in futures:
+            record = future.result()
+            if record is None:
+                continue
+            structure["files"].append(record)
+            structure["total_files"] += 1
+            if record["extension"]:
+                structure["languages"][record["extension"]] += 1
+
+        # same pass now yields per-extension counts; most_common() orders
+        # the dict by frequency instead of the old alphabetical extension list
+        structure["languages"] = dict(structure["languages"].most_common())
         return structure
     
+    IMPORTANT_FILES = (
+        "README.md",
+        "setup.py",
+        "requirements.txt",
+        "package.json",
+        "Cargo.toml",
+        "go.mod",
+        "docker-compose.yml",
+        "Dockerfile",
+        ".github/workflows"
+    )
+
     def read_important_files(self, repo_path: str) -> dict:
-        """Read key files from repository."""
-        
-        important_files = {
-            "README.md": None,
-            "setup.py": None,
-            "requirements.txt": None,
-            "package.json": None,
-            "Cargo.toml": None,
-            "go.mod": None,
-            "docker-compose.yml": None,
-            "Dockerfile": None,
-            ".github/workflows": None
-        }
-        
-        content = {}
-        
-        for file in important_files:
-            file_path = os.path.join(repo_path, file)
-            
-            if os.path.isfile(file_path):
-                try:
-                    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                        file_content = f.read()
-                        if len(file_content) < 50000:  # Limit to 50KB
-                            content[file] = file_content
-                        else:
-                            content[file] = file_content[:50000] + "\n... (truncated)"
-                except Exception as e:
-                    content[file] = f"[Error reading file: {str(e)}]"
-        
-        return content
+        """Read key files from repository.
+
+        One scandir of the repo root answers all the top-level existence
+        checks in a single getdents call instead of a stat per candidate;
+        the reads themselves are independent blocking I/O, so they run
+        concurrently and elapsed time is the slowest file, not the sum.
+        """
+
+        try:
+            with os.scandir(repo_path) as entries:
+                present = {e.name: e.is_file() for e in entries}
+        except OSError:
+            return {}
+
+        wanted = []
+        for file in self.IMPORTANT_FILES:
+            if '/' in file:
+                # nested candidates fall back to one stat each
+                if os.path.isfile(os.path.join(repo_path, file)):
+                    wanted.append(file)
+            elif present.get(file):
+                wanted.append(file)
+
+        if not wanted:
+            return {}
+
+        def _read_one(file):
+            try:
+                with open(os.path.join(repo_path, file), 'r',
+                          encoding='utf-8', errors='ignore') as f:
+                    file_content = f.read()
+            except Exception as e:
+                return file, f"[Error reading file: {str(e)}]"
+            if len(file_content) < 50000:  # Limit to 50KB
+                return file, file_content
+            return file, file_content[:50000] + "\n... (truncated)"
+
+        with ThreadPoolExecutor(max_workers=len(wanted)) as executor:
+            return dict(executor.map(_read_one, wanted))
     
     def cleanup(self):
         """Clean up cache directory."""
@@ -1,6 +1,31 @@
 # tools/text_splitter.py
+from hashlib import blake2b
 from langchain_text_splitters import RecursiveCharacterTextSplitter # type: ignore
 
+# Splitters are stateless: one instance per (chunk_size, chunk_overlap)
+# instead of a fresh construction per call.
+_SPLITTERS = {}
+
+# Split results keyed by (params, content digest): re-running the pipeline
+# over unchanged files skips the splitting work entirely. Hash keys keep the
+# cache from pinning a second copy of every file in memory; bounded FIFO.
+_SPLIT_CACHE = {}
+_SPLIT_CACHE_MAX = 4096
+
 def split_text(text, chunk_size=800, chunk_overlap=100):
-    splitter = RecursiveCharacterTextSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
-    return splitter.split_text(text)
+    key = (chunk_size, chunk_overlap,
+           blake2b(text.encode("utf-8", "replace"), digest_size=16).digest())
+    cached = _SPLIT_CACHE.get(key)
+    if cached is not None:
+        return cached
+
+    splitter = _SPLITTERS.get((chunk_size, chunk_overlap))
+    if splitter is None:
+        splitter = RecursiveCharacterTextSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+        _SPLITTERS[(chunk_size, chunk_overlap)] = splitter
+
+    parts = splitter.split_text(text)
+    if len(_SPLIT_CACHE) >= _SPLIT_CACHE_MAX:
+        _SPLIT_CACHE.pop(next(iter(_SPLIT_CACHE)))
+    _SPLIT_CACHE[key] = parts
+    return parts
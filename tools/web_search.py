@@ -1,10 +1,23 @@
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict
 
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
 
 class WebSearchTool:
     def __init__(self):
         self.session = requests.Session()
+        # One pooled HTTPS connection set with retries: back-to-back searches
+        # reuse the TCP+TLS connection instead of paying a fresh handshake
+        # per call.
+        adapter = HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=20,
+            max_retries=Retry(total=3, backoff_factor=0.5),
+        )
+        self.session.mount("https://", adapter)
 
     def search_documentation(self, query: str, max_results: int = 5) -> List[Dict]:
         try:
@@ -31,7 +44,7 @@ class WebSearchTool:
             url = f"https://api.github.com/search/repositories?q={repo_name}&sort=stars&order=desc"
             headers = {"Accept": "application/vnd.github.v3+json"}
 
-            response = requests.get(url, headers=headers, timeout=10)
+            response = self.session.get(url, headers=headers, timeout=10)
 
             if response.status_code == 200:
                 data = response.json()
@@ -52,3 +65,14 @@ class WebSearchTool:
             pass
 
         return {"search_term": repo_name, "results": [], "status": "unavailable"}
+
+    def search_github_many(self, repo_names: List[str]) -> List[Dict]:
+        """Run several GitHub searches concurrently over the shared session.
+
+        The pooled connections let the requests overlap in flight while
+        results come back in input order.
+        """
+        if not repo_names:
+            return []
+        with ThreadPoolExecutor(max_workers=min(len(repo_names), 8)) as executor:
+            return list(executor.map(self.search_github, repo_names))
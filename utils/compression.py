@@ -0,0 +1,87 @@
+import re
+
+# Prompt compression for LLM calls: repo context is often dominated by
+# boilerplate (comments, blank runs, repeated lines, long file bodies) that
+# adds input tokens without adding information.
+
+_CODE_COMMENT_RE = re.compile(r"^\s*(#|//|/\*|\*)")
+
+# When a contiguous block exceeds this many lines, keep head + tail only
+MAX_BLOCK_LINES = 60
+BLOCK_HEAD_LINES = 40
+BLOCK_TAIL_LINES = 10
+
+
+def _truncate_block(lines):
+    """Keep the head and tail of an oversized block, eliding the middle."""
+    if len(lines) <= MAX_BLOCK_LINES:
+        return lines
+    elided = len(lines) - BLOCK_HEAD_LINES - BLOCK_TAIL_LINES
+    return (
+        lines[:BLOCK_HEAD_LINES]
+        + [f"[... {elided} lines elided ...]"]
+        + lines[-BLOCK_TAIL_LINES:]
+    )
+
+
+def compress_context(text, target_ratio=0.35):
+    """
+    Compress verbose context text before injecting it into an LLM prompt.
+
+    Applies cheap deterministic passes: collapse blank-line runs, drop
+    duplicate lines after their first occurrence, strip code comments, and
+    truncate oversized blocks to head + tail with an elision marker.
+    Compression stops early once the text fits within target_ratio of the
+    original length.
+    """
+    if not text:
+        return text
+
+    original_len = len(text)
+    target_len = int(original_len * target_ratio)
+
+    # Pass 1: collapse blank runs and drop exact duplicate lines
+    seen = set()
+    lines = []
+    blank_run = 0
+    for line in text.split("\n"):
+        stripped = line.rstrip()
+        if not stripped.strip():
+            blank_run += 1
+            if blank_run > 1:
+                continue
+        else:
+            blank_run = 0
+            key = stripped.strip()
+            # Only dedupe substantial lines; short ones (braces, markers) recur legitimately
+            if len(key) > 40:
+                if key in seen:
+                    continue
+                seen.add(key)
+        lines.append(stripped)
+
+    compressed = "\n".join(lines)
+    if len(compressed) <= target_len:
+        return compressed
+
+    # Pass 2: strip code comments
+    lines = [l for l in lines if not _CODE_COMMENT_RE.match(l)]
+    compressed = "\n".join(lines)
+    if len(compressed) <= target_len:
+        return compressed
+
+    # Pass 3: truncate blocks (separated by blank lines) to head + tail
+    blocks = []
+    current = []
+    for line in lines:
+        if line.strip():
+            current.append(line)
+        else:
+            if current:
+                blocks.extend(_truncate_block(current))
+                current = []
+            blocks.append(line)
+    if current:
+        blocks.extend(_truncate_block(current))
+
+    return "\n".join(blocks)
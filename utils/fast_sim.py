@@ -0,0 +1,51 @@
+import numpy as np
+
+# Fast cosine-similarity scan for small in-process caches (per-query lookups
+# against a centroid matrix). Qdrant remains the store for anything larger.
+# When numba is installed the kernel is JIT-compiled with fastmath+parallel;
+# otherwise the numpy matmul path (BLAS, already SIMD) is used.
+
+try:
+    from numba import njit, prange
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _dot_all(q, M):
+        K, D = M.shape
+        out = np.empty(K, np.float32)
+        for i in prange(K):
+            s = 0.0
+            for d in range(D):
+                s += q[d] * M[i, d]
+            out[i] = s
+        return out
+
+except ImportError:
+    def _dot_all(q, M):
+        return M @ q
+
+
+def normalize_rows(M):
+    """L2-normalize each row of a (K, D) float32 matrix in place-safe fashion."""
+    M = np.asarray(M, dtype=np.float32)
+    norms = np.linalg.norm(M, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return M / norms
+
+
+def topk_cosine(q, M, k):
+    """
+    Return (indices, scores) of the k rows of M most similar to q.
+
+    q: (D,) query vector, M: (K, D) matrix; both are expected pre-normalized
+    so the dot product equals cosine similarity.
+    """
+    q = np.ascontiguousarray(q, dtype=np.float32)
+    M = np.ascontiguousarray(M, dtype=np.float32)
+    scores = _dot_all(q, M)
+    k = min(k, len(scores))
+    if k == len(scores):
+        idx = np.argsort(-scores)
+    else:
+        idx = np.argpartition(-scores, k)[:k]
+        idx = idx[np.argsort(-scores[idx])]
+    return idx, scores[idx]
@@ -0,0 +1,68 @@
+import json
+import os
+import tempfile
+import time
+
+try:
+    import orjson  # C codec, several times faster than stdlib json
+except ImportError:
+    orjson = None
+
+# File-backed job state shared across gunicorn workers. The analysis and
+# generation queues hand out job ids that the frontend polls; under the
+# multi-worker production config a poll can land on a different process
+# than the one running the job, so state kept only in a per-process dict
+# 404s there. Each job is one small file beside the other data stores,
+# written atomically by the owning worker and readable by any other. The
+# path is anchored to this file so every worker resolves the same directory
+# regardless of CWD (gunicorn chdirs into backend/, the dev server doesn't).
+JOBS_DIR = os.path.join(os.path.dirname(__file__), '..', 'backend', 'data', 'jobs')
+
+# Job files past this age are pruned whenever a new job is created; pollers
+# stop caring about a job long before then.
+JOB_TTL_SECONDS = 3600
+
+def _job_path(kind, job_id):
+    return os.path.join(JOBS_DIR, kind, f'{job_id}.json')
+
+def write_job(kind, job_id, state):
+    """Persist a job's full state (single-buffer write, atomic rename)."""
+    dirname = os.path.join(JOBS_DIR, kind)
+    os.makedirs(dirname, exist_ok=True)
+    if orjson is not None:
+        payload = orjson.dumps(state)
+    else:
+        payload = json.dumps(state, separators=(',', ':')).encode()
+    fd, tmp = tempfile.mkstemp(dir=dirname, suffix='.tmp')
+    try:
+        os.write(fd, payload)
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+    os.replace(tmp, _job_path(kind, job_id))
+
+def read_job(kind, job_id):
+    """Load a job's state from any worker, or None if unknown."""
+    try:
+        if orjson is not None:
+            with open(_job_path(kind, job_id), 'rb') as f:
+                return orjson.loads(f.read())
+        with open(_job_path(kind, job_id), 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def prune_jobs(kind):
+    """Drop job files past their TTL; called when a new job is created."""
+    try:
+        entries = os.scandir(os.path.join(JOBS_DIR, kind))
+    except OSError:
+        return
+    cutoff = time.time() - JOB_TTL_SECONDS
+    with entries:
+        for entry in entries:
+            try:
+                if entry.stat().st_mtime < cutoff:
+                    os.unlink(entry.path)
+            except OSError:
+                pass
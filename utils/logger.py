@@ -1,32 +1,59 @@
+import atexit
 import logging
+import queue
 import sys
 import os
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+# All loggers share one queue drained by a single background listener:
+# logger.info(...) just enqueues, so callers never block on formatting or
+# the file-write syscall, and concurrent agent threads don't contend on
+# handler locks.
+_LOG_QUEUE = None
+_LISTENER = None
+
+def _get_log_queue():
+    global _LOG_QUEUE, _LISTENER
+    if _LOG_QUEUE is not None:
+        return _LOG_QUEUE
 
-def setup_logger(name=__name__, log_level=logging.INFO):
-    """
-    Sets up a logger with console and file handlers.
-    """
-    logger = logging.getLogger(name)
-    logger.setLevel(log_level)
-    
-    # Check if handlers already exist to avoid duplicate logs
-    if logger.hasHandlers():
-        return logger
-        
     formatter = logging.Formatter(
         '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     )
-    
+
     # Console Handler
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
-    
-    # File Handler
+
+    # File Handler; rotation bounds disk use, delay=True defers creating
+    # the file until something is actually logged
     log_dir = "logs"
     os.makedirs(log_dir, exist_ok=True)
-    file_handler = logging.FileHandler(os.path.join(log_dir, "app.log"))
+    file_handler = RotatingFileHandler(
+        os.path.join(log_dir, "app.log"),
+        maxBytes=10_000_000, backupCount=5, delay=True
+    )
     file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
-    
+
+    _LOG_QUEUE = queue.Queue(-1)
+    _LISTENER = QueueListener(
+        _LOG_QUEUE, console_handler, file_handler, respect_handler_level=True
+    )
+    _LISTENER.start()
+    atexit.register(_LISTENER.stop)
+    return _LOG_QUEUE
+
+def setup_logger(name=__name__, log_level=logging.INFO):
+    """
+    Sets up a logger whose records drain through the shared listener thread.
+    """
+    logger = logging.getLogger(name)
+    logger.setLevel(log_level)
+
+    # Check if handlers already exist to avoid duplicate logs
+    if logger.hasHandlers():
+        return logger
+
+    logger.addHandler(QueueHandler(_get_log_queue()))
+
     return logger
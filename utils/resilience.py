@@ -1,32 +1,73 @@
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
-import requests
+import asyncio
+import functools
 import logging
+import random
+import time
+
+import requests
 
 # Configure logger
 logger = logging.getLogger(__name__)
 
-def log_retry_attempt(retry_state):
-    """Log retry attempts."""
-    logger.warning(
-        f"Retrying {retry_state.fn.__name__} "
-        f"Attempt {retry_state.attempt_number} "
-        f"after {retry_state.outcome.exception()}"
-    )
+def _retrying(attempts, exceptions, multiplier, min_wait, max_wait):
+    """Build a retry decorator with a zero-overhead success path.
+
+    A successful call costs one try/return — no Retrying object, no
+    per-call state, no log formatting. Waits grow exponentially
+    (multiplier * 2^attempt, clamped to [min_wait, max_wait]) with a
+    little jitter, matching the tenacity configuration this replaces,
+    and the last failure is re-raised as-is.
+
+    Coroutine functions get an async wrapper, like tenacity's
+    AsyncRetrying detection: calling one inside the sync loop would just
+    return the coroutine object on the first attempt, and the exception
+    would surface later at await, outside the retry loop.
+    """
+    def decorate(fn):
+        if asyncio.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                for attempt in range(attempts):
+                    try:
+                        return await fn(*args, **kwargs)
+                    except exceptions as e:
+                        if attempt == attempts - 1:
+                            raise
+                        wait = min(max_wait, max(min_wait, multiplier * 2 ** attempt))
+                        logger.warning(
+                            "Retrying %s Attempt %d after %s",
+                            fn.__name__, attempt + 1, e
+                        )
+                        await asyncio.sleep(wait + random.random())
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            for attempt in range(attempts):
+                try:
+                    return fn(*args, **kwargs)
+                except exceptions as e:
+                    if attempt == attempts - 1:
+                        raise
+                    wait = min(max_wait, max(min_wait, multiplier * 2 ** attempt))
+                    logger.warning(
+                        "Retrying %s Attempt %d after %s",
+                        fn.__name__, attempt + 1, e
+                    )
+                    time.sleep(wait + random.random())
+        return wrapper
+    return decorate
 
 # Standard retry configuration for API calls
-api_retry = retry(
-    stop=stop_after_attempt(3),
-    wait=wait_exponential(multiplier=1, min=4, max=10),
-    retry=retry_if_exception_type((requests.exceptions.RequestException, TimeoutError)),
-    before_sleep=log_retry_attempt,
-    reraise=True
+api_retry = _retrying(
+    attempts=3,
+    exceptions=(requests.exceptions.RequestException, TimeoutError),
+    multiplier=1, min_wait=4, max_wait=10
 )
 
 # Retry configuration for LLM calls (often have rate limits)
-llm_retry = retry(
-    stop=stop_after_attempt(5),
-    wait=wait_exponential(multiplier=2, min=2, max=60),
-    retry=retry_if_exception_type(Exception), # Broad exception for now, refine for specific LLM errors
-    before_sleep=log_retry_attempt,
-    reraise=True
+llm_retry = _retrying(
+    attempts=5,
+    exceptions=(Exception,),  # Broad exception for now, refine for specific LLM errors
+    multiplier=2, min_wait=2, max_wait=60
 )
@@ -1,36 +1,47 @@
 import re
 import os
+from functools import lru_cache
 from urllib.parse import urlparse
 from pathlib import Path
 
+# Compiled once at import; validators sit on request hot paths
+_GITHUB_URL_RE = re.compile(r"^https?://(www\.)?github\.com/[\w-]+/[\w.-]+/?$")
+_PROJECT_NAME_RE = re.compile(r"^[\w\s-]+$")
+
 def validate_github_url(url: str) -> bool:
     """
     Validates if the given URL is a valid GitHub repository URL.
     """
     if not url:
         return False
-    
-    # Basic pattern for GitHub URLs
-    pattern = r"^https?://(www\.)?github\.com/[\w-]+/[\w.-]+/?$"
-    return bool(re.match(pattern, url))
+
+    return bool(_GITHUB_URL_RE.match(url))
+
+@lru_cache(maxsize=32)
+def _real_base(base_dir: str) -> str:
+    # base dirs repeat across calls; resolve each one once
+    return os.path.realpath(base_dir)
 
 def validate_file_path(path: str, base_dir: str = None) -> bool:
     """
     Validates if a file path is safe and within the allowed directory.
     """
     try:
-        # Resolve absolute path
-        abs_path = os.path.abspath(path)
-        
-        # Check for traversal attempts
+        # Containment via realpath + commonpath: realpath resolves ".."
+        # segments and symlinks, and commonpath is component-wise — unlike
+        # the old startswith check, /base2 is not "inside" /base.
+        if base_dir:
+            abs_path = os.path.realpath(path)
+            abs_base = _real_base(base_dir)
+            try:
+                return os.path.commonpath([abs_path, abs_base]) == abs_base
+            except ValueError:
+                return False
+
+        # Without a base to contain to, reject traversal outright
         if ".." in path.split(os.sep):
             return False
-            
-        # If base_dir is provided, ensure path is within it
-        if base_dir:
-            abs_base = os.path.abspath(base_dir)
-            return abs_path.startswith(abs_base)
-            
+
         return True
     except Exception:
         return False
@@ -41,13 +52,25 @@ def sanitize_input(text: str) -> str:
     """
     if not text:
         return ""
-        
+
+    # Fast path: short printable ASCII with no edge whitespace is the common
+    # case for prompt fields and needs no cleanup (isprintable() rules out
+    # null bytes; tabs/newlines are not printable, so only spaces can hide
+    # at the edges).
+    if (len(text) <= 256 and text.isascii() and text.isprintable()
+            and text[0] != ' ' and text[-1] != ' '):
+        return text
+
+    return _sanitize_slow(text)
+
+@lru_cache(maxsize=32)
+def _sanitize_slow(text: str) -> str:
     # Remove null bytes
     text = text.replace("\0", "")
-    
+
     # Strip whitespace
     text = text.strip()
-    
+
     return text
 
 def validate_project_name(name: str) -> bool:
@@ -56,6 +79,5 @@ def validate_project_name(name: str) -> bool:
     """
     if not name:
         return False
-    
-    pattern = r"^[\w\s-]+$"
-    return bool(re.match(pattern, name))
+
+    return bool(_PROJECT_NAME_RE.match(name))